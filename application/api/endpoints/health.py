@@ -30,6 +30,7 @@ import datetime
 import typing
 
 import fastapi
+import orjson
 import prometheus_client
 
 import application.prometheus_metrics
@@ -47,6 +48,10 @@ _INFRASTRUCTURE_CACHE_SUPPRESSION_HEADERS: dict[str, str] = {
     "Pragma": "no-cache",
 }
 
+# The liveness response body never changes, so it is serialised once at
+# import rather than on every probe.
+_SERIALISED_BODY_OF_HEALTH_CHECK = orjson.dumps({"status": "healthy"})
+
 
 @health_router.get(
     "/health",
@@ -76,7 +81,7 @@ _INFRASTRUCTURE_CACHE_SUPPRESSION_HEADERS: dict[str, str] = {
         },
     },
 )
-async def health_check() -> fastapi.responses.JSONResponse:
+async def health_check() -> fastapi.responses.Response:
     """
     Return a simple healthy status when the service process is running.
 
@@ -84,8 +89,9 @@ async def health_check() -> fastapi.responses.JSONResponse:
     responsibility of the readiness endpoint (``GET /health/ready``).
     Load balancers should use this endpoint for liveness probing only.
     """
-    return fastapi.responses.JSONResponse(
-        content={"status": "healthy"},
+    return fastapi.responses.Response(
+        content=_SERIALISED_BODY_OF_HEALTH_CHECK,
+        media_type="application/json",
         headers=_INFRASTRUCTURE_CACHE_SUPPRESSION_HEADERS,
     )
 
@@ -192,7 +198,7 @@ async def health_check() -> fastapi.responses.JSONResponse:
         },
     },
 )
-async def readiness_check(request: fastapi.Request) -> fastapi.responses.JSONResponse:
+async def readiness_check(request: fastapi.Request) -> fastapi.responses.ORJSONResponse:
     """
     Check the initialisation status of all backend services.
 
@@ -277,7 +283,7 @@ async def readiness_check(request: fastapi.Request) -> fastapi.responses.JSONRes
         retry_after_not_ready_in_seconds = getattr(request.app.state, "retry_after_not_ready_in_seconds", 10)
         response_headers["Retry-After"] = str(retry_after_not_ready_in_seconds)
 
-    return fastapi.responses.JSONResponse(
+    return fastapi.responses.ORJSONResponse(
         content={
             "status": readiness_status,
             "checks": checks,
@@ -355,7 +361,7 @@ async def readiness_check(request: fastapi.Request) -> fastapi.responses.JSONRes
         },
     },
 )
-async def get_metrics(request: fastapi.Request) -> fastapi.responses.JSONResponse:
+async def get_metrics(request: fastapi.Request) -> fastapi.responses.ORJSONResponse:
     """
     Return a point-in-time snapshot of request count and latency metrics.
 
@@ -382,7 +388,7 @@ async def get_metrics(request: fastapi.Request) -> fastapi.responses.JSONRespons
     else:
         content = metrics_collector.snapshot()
 
-    return fastapi.responses.JSONResponse(
+    return fastapi.responses.ORJSONResponse(
         content=content,
         headers=_INFRASTRUCTURE_CACHE_SUPPRESSION_HEADERS,
     )
@@ -121,7 +121,7 @@ async def handle_image_generation_request(
             application.api.dependencies.get_admission_controller_for_image_generation,
         ),
     ],
-) -> fastapi.responses.JSONResponse:
+) -> fastapi.responses.ORJSONResponse:
     """
     Generate images, optionally enhancing the prompt first.
 
@@ -158,7 +158,10 @@ async def handle_image_generation_request(
     # Serialise with exclude_unset=True so that optional fields
     # (enhanced_prompt, warnings) are omitted entirely from the JSON
     # payload when they were not explicitly set on the response model.
-    return fastapi.responses.JSONResponse(
+    # The body carries every base64-encoded image, often several
+    # megabytes, so it is rendered with orjson rather than the standard
+    # library encoder.
+    return fastapi.responses.ORJSONResponse(
         content=response_model.model_dump(exclude_unset=True),
         headers={"Cache-Control": "no-store"},
     )
@@ -91,7 +91,7 @@ async def handle_prompt_enhancement_request(
             application.api.dependencies.get_prompt_enhancement_service,
         ),
     ],
-) -> fastapi.responses.JSONResponse:
+) -> fastapi.responses.ORJSONResponse:
     """
     Enhance the provided prompt by forwarding it to the large language model.
 
@@ -116,7 +116,7 @@ async def handle_prompt_enhancement_request(
         created=int(time.time()),
     )
 
-    return fastapi.responses.JSONResponse(
+    return fastapi.responses.ORJSONResponse(
         content=response_model.model_dump(),
         headers={"Cache-Control": "no-store"},
     )
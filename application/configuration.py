@@ -11,6 +11,9 @@ source of truth for all runtime configuration within the service process.
 
 """
 
+import importlib.util
+import typing
+
 import pydantic
 import pydantic_settings
 
@@ -172,6 +175,16 @@ class ApplicationConfiguration(pydantic_settings.BaseSettings):
         ),
     )
 
+    maximum_number_of_entries_in_cache_of_enhanced_prompts: int = pydantic.Field(
+        default=0,
+        ge=0,
+        description=(
+            "Maximum number of enhanced prompts retained in the in-process least-recently-used "
+            "cache. The cache is consulted only when the temperature is 0.0, where enhancement "
+            "is deterministic. Default is 0 (caching disabled)."
+        ),
+    )
+
     # ── Stable Diffusion settings ─────────────────────────────────────────
 
     id_of_stable_diffusion_model: str = pydantic.Field(
@@ -198,13 +211,32 @@ class ApplicationConfiguration(pydantic_settings.BaseSettings):
     )
 
     number_of_inference_steps_of_stable_diffusion: int = pydantic.Field(
-        default=20,
+        default=12,
         ge=1,
         description=(
             "Number of diffusion inference steps per image. Lower values reduce latency at the cost of output quality."
         ),
     )
 
+    scheduler_of_stable_diffusion: typing.Literal["dpm_solver_multistep", "default"] = pydantic.Field(
+        default="dpm_solver_multistep",
+        description=(
+            "Denoising scheduler: 'dpm_solver_multistep' uses DPM-Solver++, which "
+            "reaches comparable quality in roughly half the steps of the scheduler "
+            "saved with the model; 'default' keeps the saved scheduler."
+        ),
+    )
+
+    quantisation_of_unet_of_stable_diffusion: typing.Literal["none", "int8"] = pydantic.Field(
+        default="none",
+        description=(
+            "Weight quantisation of the Stable Diffusion U-Net on CUDA devices: "
+            "'int8' loads the U-Net as 8-bit integers through bitsandbytes, halving "
+            "its weight memory, and is rejected at startup when bitsandbytes is not "
+            "installed; 'none' disables quantisation. Ignored on CPU."
+        ),
+    )
+
     guidance_scale_of_stable_diffusion: float = pydantic.Field(
         default=7.0,
         ge=0.0,
@@ -219,6 +251,16 @@ class ApplicationConfiguration(pydantic_settings.BaseSettings):
         description=("Enable the NSFW safety checker. Disabling removes content filtering from generated images."),
     )
 
+    compilation_of_unet_for_stable_diffusion: bool = pydantic.Field(
+        default=False,
+        description=(
+            "Compile the Stable Diffusion U-Net with torch.compile on CUDA devices "
+            "to fuse its convolution and linear kernels. Compilation lengthens "
+            "startup and each new image resolution pays a one-time recompilation "
+            "on its first request. Ignored on CPU."
+        ),
+    )
+
     inference_timeout_by_stable_diffusion_per_baseline_unit_in_seconds: float | None = pydantic.Field(
         default=None,
         gt=0,
@@ -316,6 +358,27 @@ class ApplicationConfiguration(pydantic_settings.BaseSettings):
         env_prefix="TEXT_TO_IMAGE_",
     )
 
+    # ── Validation ────────────────────────────────────────────────────────
+
+    @pydantic.field_validator("quantisation_of_unet_of_stable_diffusion")
+    @classmethod
+    def _require_bitsandbytes_for_int8_quantisation(cls, quantisation_of_unet: str) -> str:
+        """
+        Reject ``int8`` quantisation when ``bitsandbytes`` is not installed.
+
+        ``bitsandbytes`` is not part of the default requirements, since its
+        8-bit kernels exist only for CUDA.  Without this check the missing
+        package would only surface as an import error deep inside model
+        loading, after the model download.
+        """
+        if quantisation_of_unet == "int8" and importlib.util.find_spec("bitsandbytes") is None:
+            raise ValueError(
+                "TEXT_TO_IMAGE_QUANTISATION_OF_UNET_OF_STABLE_DIFFUSION=int8 requires the "
+                "bitsandbytes package, which is not installed. Install bitsandbytes or set "
+                "the value to 'none'."
+            )
+        return quantisation_of_unet
+
     # ── Sentinel resolution ───────────────────────────────────────────────
 
     _resolved_inference_device: str = ""
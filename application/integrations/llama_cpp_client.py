@@ -41,16 +41,26 @@ before — every request is sent to the upstream regardless of prior
 failure history.
 """
 
-import json
+import asyncio
+import collections
+import functools
+import hashlib
+import typing
 
 import httpx
+import orjson
 import structlog
 
 import application.circuit_breaker
 import application.exceptions
+import application.prometheus_metrics
 
 logger = structlog.get_logger()
 
+# Timeout of each ``GET /health`` request sent while warming up the
+# connection pool at startup.
+_TIMEOUT_OF_CONNECTION_POOL_WARMUP_REQUEST_IN_SECONDS = 5.0
+
 DEFAULT_SYSTEM_PROMPT = (
     "You are an expert at enhancing text-to-image prompts."
     " Transform the user's simple prompt into a detailed, visually descriptive prompt."
@@ -69,10 +79,14 @@ class LlamaCppClient:
     ``close`` method when the application shuts down to release network
     resources (file descriptors and TCP connections).
 
-    The client is stateless with respect to request processing: each
-    call to ``enhance_prompt`` is independent and does not rely on any
-    state from previous calls.  This makes the client safe for
-    concurrent use from multiple async tasks.
+    At any temperature other than 0.0, each call to ``enhance_prompt`` is
+    independent and does not rely on any state from previous calls.  At
+    temperature 0.0, where enhancement is deterministic, concurrent calls
+    for the same prompt share one upstream request, and an optional
+    least-recently-used cache serves repeated prompts.  Both structures
+    are only read and written between ``await`` points on the event loop
+    thread, so the client is safe for concurrent use from multiple async
+    tasks.
     """
 
     def __init__(
@@ -85,6 +99,7 @@ class LlamaCppClient:
         size_of_connection_pool: int = 10,
         maximum_number_of_bytes_of_response_body: int = 1_048_576,
         circuit_breaker: application.circuit_breaker.CircuitBreaker | None = None,
+        maximum_number_of_entries_in_cache_of_enhanced_prompts: int = 0,
     ) -> None:
         """
         Initialise the llama.cpp client.
@@ -118,6 +133,11 @@ class LlamaCppClient:
                 timeout duration when the llama.cpp server is consistently
                 failing.  When ``None``, every request is sent to the
                 upstream regardless of prior failure history.
+            maximum_number_of_entries_in_cache_of_enhanced_prompts: Maximum
+                number of enhanced prompts retained in the least-recently-used
+                cache.  The cache is consulted only when ``temperature`` is
+                0.0; at any other temperature, or when this value is 0,
+                every request is sent to the upstream.
         """
         self.base_url_of_large_language_model_server = base_url_of_large_language_model_server
         self._temperature = temperature
@@ -125,6 +145,36 @@ class LlamaCppClient:
         self._system_prompt = system_prompt
         self._maximum_number_of_bytes_of_response_body = maximum_number_of_bytes_of_response_body
         self._circuit_breaker = circuit_breaker
+        self._size_of_connection_pool = size_of_connection_pool
+        self._maximum_number_of_entries_in_cache_of_enhanced_prompts = (
+            maximum_number_of_entries_in_cache_of_enhanced_prompts
+        )
+        self._enhancement_of_prompts_is_deterministic = temperature == 0.0
+        self._cache_of_enhanced_prompts_is_enabled = (
+            self._enhancement_of_prompts_is_deterministic and maximum_number_of_entries_in_cache_of_enhanced_prompts > 0
+        )
+        self._cache_of_enhanced_prompts: collections.OrderedDict[str, str] = collections.OrderedDict()
+        self._in_flight_enhancements_of_prompts: dict[str, asyncio.Future[str]] = {}
+
+        # Every field of the chat completion request body except the user
+        # prompt is fixed for the lifetime of the client, so the bytes
+        # before and after the user prompt are serialised once here and
+        # each request only serialises the prompt itself.  The result is
+        # byte-for-byte identical to serialising the full body:
+        #   {"messages":[{system},{"role":"user","content":<prompt>}],
+        #    "temperature":...,"max_tokens":...,"stream":false}
+        self._serialised_prefix_of_request_body_for_chat_completion = (
+            b'{"messages":['
+            + orjson.dumps({"role": "system", "content": system_prompt})
+            + b',{"role":"user","content":'
+        )
+        self._serialised_suffix_of_request_body_for_chat_completion = (
+            b'}],"temperature":'
+            + orjson.dumps(temperature)
+            + b',"max_tokens":'
+            + orjson.dumps(maximum_tokens)
+            + b',"stream":false}'
+        )
         self.http_client = httpx.AsyncClient(
             base_url=base_url_of_large_language_model_server,
             timeout=httpx.Timeout(request_timeout_in_seconds),
@@ -177,6 +227,102 @@ class LlamaCppClient:
             prompt_length=len(original_prompt),
         )
 
+        if not self._enhancement_of_prompts_is_deterministic:
+            return await self._request_enhanced_prompt_from_upstream(original_prompt)
+
+        # ── Cache of enhanced prompts ─────────────────────────────────
+        #
+        # At temperature 0.0 the same original prompt always produces the
+        # same enhanced prompt, so a cached result is indistinguishable
+        # from a fresh upstream call and saves a full large language model
+        # round-trip.  Cache hits bypass the circuit breaker because no
+        # upstream call is made.
+        key_of_enhanced_prompt = self._compute_key_in_cache_of_enhanced_prompts(original_prompt)
+        if self._cache_of_enhanced_prompts_is_enabled:
+            cached_text_of_enhanced_prompt = self._cache_of_enhanced_prompts.get(key_of_enhanced_prompt)
+            if cached_text_of_enhanced_prompt is not None:
+                self._cache_of_enhanced_prompts.move_to_end(key_of_enhanced_prompt)
+                application.prometheus_metrics.counter_of_lookups_in_cache_of_enhanced_prompts.labels(
+                    result="hit",
+                ).inc()
+                logger.info(
+                    "prompt_enhancement_served_from_cache",
+                    enhanced_prompt_length=len(cached_text_of_enhanced_prompt),
+                )
+                logger.info(
+                    "prompt_enhancement_completed",
+                    enhanced_prompt_length=len(cached_text_of_enhanced_prompt),
+                    served_from_cache=True,
+                    coalesced=False,
+                )
+                return cached_text_of_enhanced_prompt
+            application.prometheus_metrics.counter_of_lookups_in_cache_of_enhanced_prompts.labels(
+                result="miss",
+            ).inc()
+
+        # ── Single-flight coalescing ──────────────────────────────────
+        #
+        # Concurrent requests for the same deterministic enhancement share
+        # one upstream call instead of each occupying a connection and a
+        # large language model decode.  The upstream call runs as its own
+        # task and every caller awaits it through ``asyncio.shield``, so a
+        # caller that is cancelled (for example because its client
+        # disconnected) does not cancel the call for the others.
+        in_flight_enhancement = self._in_flight_enhancements_of_prompts.get(key_of_enhanced_prompt)
+        if in_flight_enhancement is None:
+            in_flight_enhancement = asyncio.ensure_future(
+                self._request_and_cache_enhanced_prompt(original_prompt, key_of_enhanced_prompt),
+            )
+            self._in_flight_enhancements_of_prompts[key_of_enhanced_prompt] = in_flight_enhancement
+            in_flight_enhancement.add_done_callback(
+                functools.partial(self._discard_in_flight_enhancement, key_of_enhanced_prompt),
+            )
+            return await asyncio.shield(in_flight_enhancement)
+
+        # A coalesced caller logs its own completion, because the
+        # ``prompt_enhancement_completed`` event from the shared upstream
+        # call is logged once, for the caller that started it.
+        logger.info("prompt_enhancement_coalesced")
+        cleaned_text_of_enhanced_prompt = await asyncio.shield(in_flight_enhancement)
+        logger.info(
+            "prompt_enhancement_completed",
+            enhanced_prompt_length=len(cleaned_text_of_enhanced_prompt),
+            served_from_cache=False,
+            coalesced=True,
+        )
+        return cleaned_text_of_enhanced_prompt
+
+    async def _request_and_cache_enhanced_prompt(self, original_prompt: str, key_of_enhanced_prompt: str) -> str:
+        """
+        Request a deterministic enhancement from the upstream and, when the
+        cache is enabled, store the result under the given key.
+        """
+        cleaned_text_of_enhanced_prompt = await self._request_enhanced_prompt_from_upstream(original_prompt)
+        if self._cache_of_enhanced_prompts_is_enabled:
+            self._store_enhanced_prompt_in_cache(key_of_enhanced_prompt, cleaned_text_of_enhanced_prompt)
+        return cleaned_text_of_enhanced_prompt
+
+    def _discard_in_flight_enhancement(
+        self, key_of_enhanced_prompt: str, in_flight_enhancement: asyncio.Future
+    ) -> None:
+        """
+        Remove a completed upstream call from the in-flight registry.
+
+        Retrieving the exception marks it as observed, so that a failed
+        call whose callers were all cancelled does not log an
+        "exception was never retrieved" warning at garbage collection.
+        """
+        del self._in_flight_enhancements_of_prompts[key_of_enhanced_prompt]
+        if not in_flight_enhancement.cancelled():
+            in_flight_enhancement.exception()
+
+    async def _request_enhanced_prompt_from_upstream(self, original_prompt: str) -> str:
+        """
+        Send one chat completion request to the llama.cpp server and
+        return the stripped enhanced prompt.
+
+        Raises the exceptions documented on ``enhance_prompt``.
+        """
         # ── Circuit breaker check ─────────────────────────────────────
         #
         # When a circuit breaker is configured, check whether the circuit
@@ -205,27 +351,18 @@ class LlamaCppClient:
                     ),
                 ) from circuit_open_error
 
-        request_body_for_chat_completion = {
-            "messages": [
-                {
-                    "role": "system",
-                    "content": self._system_prompt,
-                },
-                {
-                    "role": "user",
-                    "content": original_prompt,
-                },
-            ],
-            "temperature": self._temperature,
-            "max_tokens": self._maximum_tokens,
-            "stream": False,
-        }
+        serialised_request_body_for_chat_completion = (
+            self._serialised_prefix_of_request_body_for_chat_completion
+            + orjson.dumps(original_prompt)
+            + self._serialised_suffix_of_request_body_for_chat_completion
+        )
 
         try:
             async with self.http_client.stream(
                 "POST",
                 "/v1/chat/completions",
-                json=request_body_for_chat_completion,
+                content=serialised_request_body_for_chat_completion,
+                headers={"Content-Type": "application/json"},
             ) as http_response:
                 http_response.raise_for_status()
 
@@ -260,27 +397,22 @@ class LlamaCppClient:
                 # during receipt.  This ensures that an oversized response
                 # is detected and the connection closed as soon as the
                 # limit is exceeded, rather than buffering the full body
-                # into memory before checking its size.
+                # into memory before checking its size.  When the server
+                # declares an oversized Content-Length up front, the
+                # response is rejected before a single body byte is read.
+                declared_content_length = http_response.headers.get("content-length", "")
+                if (
+                    declared_content_length.isdigit()
+                    and int(declared_content_length) > self._maximum_number_of_bytes_of_response_body
+                ):
+                    await self._reject_response_body_that_is_too_large(int(declared_content_length))
+
                 chunks_of_response_body: list[bytes] = []
                 number_of_bytes_read = 0
                 async for chunk in http_response.aiter_bytes():
                     number_of_bytes_read += len(chunk)
                     if number_of_bytes_read > self._maximum_number_of_bytes_of_response_body:
-                        await self._record_circuit_breaker_failure()
-                        logger.error(
-                            "llama_cpp_response_too_large",
-                            number_of_bytes_of_response_body=number_of_bytes_read,
-                            maximum_number_of_bytes_of_response_body=self._maximum_number_of_bytes_of_response_body,
-                        )
-                        raise application.exceptions.LargeLanguageModelServiceUnavailableError(
-                            detail=(
-                                f"The large language model response body"
-                                f" ({number_of_bytes_read} bytes) exceeds the"
-                                f" configured maximum"
-                                f" ({self._maximum_number_of_bytes_of_response_body}"
-                                f" bytes)."
-                            ),
-                        )
+                        await self._reject_response_body_that_is_too_large(number_of_bytes_read)
                     chunks_of_response_body.append(chunk)
 
                 raw_response_body = b"".join(chunks_of_response_body)
@@ -348,10 +480,11 @@ class LlamaCppClient:
         # ── Parse JSON from raw bytes ─────────────────────────────────────
         #
         # In streaming mode, response.json() is not available.  Parse the
-        # collected bytes directly via json.loads().
+        # collected bytes directly via orjson.loads(), which also rejects
+        # invalid UTF-8 with orjson.JSONDecodeError (a ValueError subclass).
         try:
-            response_body = json.loads(raw_response_body)
-        except (ValueError, UnicodeDecodeError) as json_decode_error:
+            response_body = orjson.loads(raw_response_body)
+        except ValueError as json_decode_error:
             await self._record_circuit_breaker_failure()
             logger.error(
                 "llama_cpp_response_parsing_failed",
@@ -369,12 +502,19 @@ class LlamaCppClient:
         #   response_body["choices"][0]["message"]["content"]
         #
         # If the response structure does not match this expected layout
-        # (e.g. missing keys or empty choices list), we raise a
-        # LargeLanguageModelServiceUnavailableError rather than a generic
-        # KeyError so the client receives a meaningful 502 error response.
+        # (e.g. missing keys, an empty choices list, or a JSON array or
+        # scalar where an object is expected), we raise a
+        # PromptEnhancementError rather than a generic KeyError or
+        # TypeError so the client receives a meaningful 502 error response.
+        # A non-string content (AttributeError on strip) is treated the
+        # same way.
         try:
-            enhanced_prompt_text = response_body["choices"][0]["message"]["content"]
-        except (KeyError, IndexError) as parsing_error:
+            first_choice = response_body["choices"][0]
+            enhanced_prompt_text = first_choice["message"]["content"]
+            cleaned_text_of_enhanced_prompt: str = (
+                enhanced_prompt_text.strip() if enhanced_prompt_text is not None else ""
+            )
+        except (KeyError, IndexError, TypeError, AttributeError) as parsing_error:
             await self._record_circuit_breaker_failure()
             logger.error(
                 "llama_cpp_response_parsing_failed",
@@ -384,14 +524,12 @@ class LlamaCppClient:
                 detail="The large language model returned an unexpected response structure.",
             ) from parsing_error
 
-        if not enhanced_prompt_text or not enhanced_prompt_text.strip():
+        if not cleaned_text_of_enhanced_prompt:
             await self._record_circuit_breaker_failure()
             raise application.exceptions.PromptEnhancementError(
                 detail="The large language model returned an empty enhanced prompt.",
             )
 
-        cleaned_text_of_enhanced_prompt: str = enhanced_prompt_text.strip()
-
         # ── Token-limit truncation detection ──────────────────────────────
         #
         # The ``finish_reason`` field in the chat completion response
@@ -403,10 +541,7 @@ class LlamaCppClient:
         # incomplete (truncated).  We still return it because a truncated
         # prompt may still produce a reasonable image, but we log a WARNING
         # so operators can increase maximum_tokens if truncation recurs.
-        try:
-            finish_reason = response_body["choices"][0].get("finish_reason")
-        except (KeyError, IndexError):
-            finish_reason = None
+        finish_reason = first_choice.get("finish_reason")
 
         if finish_reason == "length":
             logger.warning(
@@ -423,10 +558,63 @@ class LlamaCppClient:
         logger.info(
             "prompt_enhancement_completed",
             enhanced_prompt_length=len(cleaned_text_of_enhanced_prompt),
+            served_from_cache=False,
+            coalesced=False,
         )
 
         return cleaned_text_of_enhanced_prompt
 
+    def _compute_key_in_cache_of_enhanced_prompts(self, original_prompt: str) -> str:
+        """
+        Derive the cache key for an original prompt.
+
+        The key is the SHA-256 digest of every input that determines the
+        enhanced prompt at temperature 0.0: the system prompt, the original
+        prompt, and the token limit, separated by the ASCII unit separator
+        so that no two distinct combinations concatenate to the same text.
+        Hashing bounds the memory of each key to 64 characters regardless
+        of the prompt length.
+        """
+        inputs_determining_enhanced_prompt = "\x1f".join(
+            (self._system_prompt, original_prompt, str(self._maximum_tokens)),
+        )
+        return hashlib.sha256(inputs_determining_enhanced_prompt.encode("utf-8")).hexdigest()
+
+    def _store_enhanced_prompt_in_cache(
+        self, key_in_cache_of_enhanced_prompts: str, text_of_enhanced_prompt: str
+    ) -> None:
+        """
+        Insert an enhanced prompt into the least-recently-used cache.
+
+        When the cache exceeds its configured capacity, the least recently
+        used entry is evicted.
+        """
+        self._cache_of_enhanced_prompts[key_in_cache_of_enhanced_prompts] = text_of_enhanced_prompt
+        self._cache_of_enhanced_prompts.move_to_end(key_in_cache_of_enhanced_prompts)
+        if len(self._cache_of_enhanced_prompts) > self._maximum_number_of_entries_in_cache_of_enhanced_prompts:
+            self._cache_of_enhanced_prompts.popitem(last=False)
+
+    async def _reject_response_body_that_is_too_large(self, number_of_bytes_of_response_body: int) -> typing.NoReturn:
+        """
+        Record an upstream failure for a response body that exceeds the
+        configured maximum and raise ``LargeLanguageModelServiceUnavailableError``.
+        """
+        await self._record_circuit_breaker_failure()
+        logger.error(
+            "llama_cpp_response_too_large",
+            number_of_bytes_of_response_body=number_of_bytes_of_response_body,
+            maximum_number_of_bytes_of_response_body=self._maximum_number_of_bytes_of_response_body,
+        )
+        raise application.exceptions.LargeLanguageModelServiceUnavailableError(
+            detail=(
+                f"The large language model response body"
+                f" ({number_of_bytes_of_response_body} bytes) exceeds the"
+                f" configured maximum"
+                f" ({self._maximum_number_of_bytes_of_response_body}"
+                f" bytes)."
+            ),
+        )
+
     async def _record_circuit_breaker_failure(self) -> None:
         """
         Notify the circuit breaker (if configured) of an upstream failure.
@@ -449,6 +637,45 @@ class LlamaCppClient:
         if self._circuit_breaker is not None:
             await self._circuit_breaker.record_success()
 
+    async def warm_up_connection_pool(self) -> None:
+        """
+        Open the connections of the pool ahead of the first real request.
+
+        Sends one concurrent ``GET /health`` request per connection slot,
+        so that each request opens its own TCP connection, which then
+        stays in the pool as an idle keep-alive connection.  The first
+        prompt enhancement requests therefore skip connection setup.
+
+        This is a best-effort optimisation: failures (for example, because
+        the llama.cpp server is still starting) are counted and logged but
+        never raised, and the pool simply opens connections on demand.
+        A single WARNING reports how many warm-up requests failed.
+        """
+        outcomes_of_warmup_requests = await asyncio.gather(
+            *(
+                self.http_client.get("/health", timeout=_TIMEOUT_OF_CONNECTION_POOL_WARMUP_REQUEST_IN_SECONDS)
+                for _ in range(self._size_of_connection_pool)
+            ),
+            return_exceptions=True,
+        )
+        number_of_connections_opened = sum(
+            isinstance(outcome, httpx.Response) for outcome in outcomes_of_warmup_requests
+        )
+        number_of_failed_warmup_requests = self._size_of_connection_pool - number_of_connections_opened
+
+        if number_of_failed_warmup_requests > 0:
+            logger.warning(
+                "llama_cpp_connection_pool_warmup_failed",
+                number_of_failed_warmup_requests=number_of_failed_warmup_requests,
+                size_of_connection_pool=self._size_of_connection_pool,
+            )
+
+        logger.info(
+            "llama_cpp_connection_pool_warmed_up",
+            number_of_connections_opened=number_of_connections_opened,
+            size_of_connection_pool=self._size_of_connection_pool,
+        )
+
     async def check_health(self) -> bool:
         """
         Ping the llama.cpp server to verify it is reachable.
@@ -34,6 +34,9 @@ real user request, the pipeline offers a ``run_startup_warmup`` method
 that performs a minimal dummy inference (1 step, 64×64, 1 image) during
 the application startup sequence.  The output is discarded, but PyTorch's
 one-time setup work is completed and amortised into the startup time.
+When the U-Net is compiled, the warmup instead runs at the production
+shape (512×512, configured steps and guidance scale), since the compiled
+graph is specialised for the input shapes it first sees.
 
 If the warmup is not performed (or fails), the pipeline falls back to the
 original behaviour: tracking first-inference state and emitting a
@@ -46,12 +49,13 @@ first-call overhead.
 import asyncio
 import base64
 import concurrent.futures
-import functools
 import gc
 import io
+import os
 import time
 
 import diffusers
+import diffusers.models.attention_processor
 import psutil
 import structlog
 import torch
@@ -67,6 +71,34 @@ logger = structlog.get_logger()
 # Larger images scale proportionally (e.g. 1024×1024 = 4.0× base).
 _NUMBER_OF_PIXELS_IN_BASELINE = 512 * 512
 
+# zlib compression level for PNG encoding.  Pillow's default (6) spends
+# most of its time searching for matches that the high-entropy, photographic
+# output of Stable Diffusion rarely yields; level 1 encodes several times
+# faster for an output only marginally larger.  PNG remains lossless at every
+# level, so the decoded pixels are unchanged.
+_COMPRESSION_LEVEL_OF_PNG_ENCODING = 1
+
+# GPUs with less total VRAM than this fall back to attention slicing, since
+# unsliced attention at 1024×1024 needs several gigabytes of activations on
+# top of the float16 model weights.
+_MINIMUM_NUMBER_OF_BYTES_OF_VRAM_FOR_SCALED_DOT_PRODUCT_ATTENTION = 6 * 1024 * 1024 * 1024
+
+# The side length of the startup warmup image when the U-Net is compiled.
+# ``torch.compile`` specialises the compiled graph for the latent shape of
+# its first forward pass, so the warmup must use the default request size
+# for the compilation it triggers to be reused by real requests.
+_SIDE_LENGTH_OF_WARMUP_IMAGE_FOR_COMPILED_UNET = 512
+
+# How long ``close`` waits for an inference of the instance that is still
+# running (typically one orphaned by a timeout) before releasing the model
+# weights regardless.  Bounded so that a hung inference cannot stall the
+# shutdown sequence beyond Uvicorn's graceful shutdown timeout.
+_MAXIMUM_WAIT_FOR_IN_FLIGHT_INFERENCES_ON_CLOSE_IN_SECONDS = 10.0
+
+# The pipeline components that hold model weights, detached explicitly in
+# ``close`` so that a stray reference to the pipeline cannot retain them.
+_NAMES_OF_SUB_MODULES_RELEASED_ON_CLOSE = ("unet", "vae", "text_encoder", "safety_checker")
+
 
 class StableDiffusionPipeline:
     """
@@ -100,11 +132,12 @@ class StableDiffusionPipeline:
         pipeline: diffusers.StableDiffusionPipeline,
         device: torch.device,
         thread_pool_executor_for_inference: concurrent.futures.ThreadPoolExecutor,
-        number_of_inference_steps: int = 20,
+        number_of_inference_steps: int = 12,
         guidance_scale: float = 7.0,
         inference_timeout_per_baseline_unit_in_seconds: float = (
             DEFAULT_TIMEOUT_OF_INFERENCE_PER_BASELINE_UNIT_IN_SECONDS
         ),
+        unet_is_compiled: bool = False,
     ) -> None:
         """
         Initialise the Stable Diffusion pipeline.
@@ -132,6 +165,9 @@ class StableDiffusionPipeline:
                 (seconds) for generating a single 512×512 baseline unit
                 image.  The actual timeout scales with the number of images
                 and pixel area.
+            unet_is_compiled: Whether the U-Net of the pipeline is wrapped
+                with ``torch.compile``.  Selects the shape of the startup
+                warmup inference.
         """
         self._pipeline = pipeline
         self._device = device
@@ -139,6 +175,20 @@ class StableDiffusionPipeline:
         self._number_of_inference_steps = number_of_inference_steps
         self._guidance_scale = guidance_scale
         self._inference_timeout_per_baseline_unit_in_seconds = inference_timeout_per_baseline_unit_in_seconds
+        self._unet_is_compiled = unet_is_compiled
+
+        # Inferences of this instance that are still running in the
+        # executor.  An inference that exceeds its timeout keeps running
+        # after the request has failed, so ``close`` waits for these before
+        # releasing the model weights.  Each future removes itself once
+        # its inference finishes.
+        self._in_flight_inferences: set[concurrent.futures.Future] = set()
+
+        # The device never changes after construction, so the CUDA check
+        # performed after every inference call (and during warmup and
+        # shutdown) is resolved once here rather than re-evaluating the
+        # ``torch.device`` attribute and string comparison each time.
+        self._inference_device_is_cuda: bool = device.type == "cuda"
 
         # Track whether the first inference has been completed, so we can
         # emit the ``first_warmup_of_inference_of_stable_diffusion`` log event
@@ -164,6 +214,68 @@ class StableDiffusionPipeline:
             return torch.device("cpu")
         return torch.device(device_preference)
 
+    @staticmethod
+    def _configure_backends_of_torch_for_inference_on_cuda() -> None:
+        """
+        Enable the cuDNN autotuner and TensorFloat-32 matrix multiplication.
+
+        Image dimensions are restricted to a small set of supported values,
+        so the cuDNN autotuner benchmarks each convolution shape once and
+        reuses the fastest algorithm for every later request of that shape.
+        TensorFloat-32 lets the float32 matrix multiplications that remain
+        under half-precision inference (for example in the scheduler and
+        the safety checker) use Tensor Cores.
+
+        These settings are process-wide; applying them once per pool
+        instance is idempotent.
+        """
+        torch.backends.cudnn.benchmark = True
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        torch.set_float32_matmul_precision("high")
+
+    @staticmethod
+    def _configure_threads_of_torch_for_inference_on_cpu(number_of_concurrency_slots: int) -> None:
+        """
+        Divide the physical CPU cores between the concurrent inferences.
+
+        PyTorch's intra-op thread pool is process-wide and defaults to one
+        thread per physical core.  With several pool instances running
+        inference at the same time, each would otherwise spawn a full set
+        of threads, and the resulting oversubscription makes every
+        inference slower than running them one after another.
+
+        These settings are process-wide; applying them once per pool
+        instance is idempotent.
+        """
+        number_of_physical_cores = psutil.cpu_count(logical=False) or os.cpu_count() or 1
+        torch.set_num_threads(max(1, number_of_physical_cores // number_of_concurrency_slots))
+
+    @staticmethod
+    def _select_torch_data_type(device: torch.device) -> torch.dtype:
+        """
+        Select the floating-point precision of the model weights.
+
+        GPUs with native bfloat16 support (NVIDIA Ampere and newer) use
+        bfloat16, which has the same two-byte footprint and Tensor Core
+        throughput as float16 but the exponent range of float32, so the
+        VAE decoder cannot overflow into NaN values (rendered as black
+        images).  Older GPUs fall back to float16.  CPU inference uses
+        float32, because half-precision arithmetic is not
+        hardware-accelerated on the CPU tier.
+
+        Args:
+            device: The resolved inference device.
+
+        Returns:
+            The ``torch.dtype`` passed to ``from_pretrained``.
+        """
+        if device.type != "cuda":
+            return torch.float32
+        if torch.cuda.is_bf16_supported():
+            return torch.bfloat16
+        return torch.float16
+
     @classmethod
     def load_pipeline(
         cls,
@@ -172,12 +284,17 @@ class StableDiffusionPipeline:
         model_revision: str = "main",
         device_preference: str = "auto",
         enable_safety_checker: bool = True,
-        number_of_inference_steps: int = 20,
+        number_of_inference_steps: int = 12,
         guidance_scale: float = 7.0,
         inference_timeout_per_baseline_unit_in_seconds: float = (
             DEFAULT_TIMEOUT_OF_INFERENCE_PER_BASELINE_UNIT_IN_SECONDS
         ),
         slot_index: int = 0,
+        number_of_concurrency_slots: int = 1,
+        enable_compilation_of_unet: bool = False,
+        mode_of_compilation_of_unet: str = "default",
+        name_of_scheduler: str = "dpm_solver_multistep",
+        quantisation_of_unet: str = "none",
     ) -> "StableDiffusionPipeline":
         """
         Download (or load from cache) a Stable Diffusion model and return
@@ -185,7 +302,10 @@ class StableDiffusionPipeline:
 
         This class method handles the entire model loading lifecycle:
         device resolution, data type selection, model download, pipeline
-        construction, and memory optimisation (attention slicing).
+        construction, memory layout and attention optimisation (channels-last
+        format and scaled dot-product attention on CUDA, attention slicing
+        on CPU and small GPUs), and optional
+        ``torch.compile`` compilation of the U-Net.
 
         Args:
             model_id: A HuggingFace model ID (e.g.
@@ -207,9 +327,50 @@ class StableDiffusionPipeline:
                 (seconds) for a single 512×512 baseline unit image.  Actual
                 timeout scales with the number of images and pixel area:
                 ``base × number_of_images × (w × h) / (512 × 512)``.
+            slot_index: Zero-based index of the concurrency slot that this
+                instance will occupy in the pipeline pool.  Used only for
+                log correlation.
+            number_of_concurrency_slots: The number of pool instances that
+                may run inference at the same time.  On CPU, the physical
+                cores are divided evenly between them.
+            enable_compilation_of_unet: When ``True`` and the device is
+                CUDA, the U-Net is wrapped with ``torch.compile`` so that
+                its convolution and linear kernels are fused.  Ignored on
+                CPU, where the Inductor backend needs a C++ compiler that
+                the slim runtime image does not ship.  Compilation
+                happens lazily on the first forward pass for each input
+                shape.  The startup warmup runs at 512×512 with the
+                configured guidance scale, so it absorbs the compilation
+                for default-sized single-image requests; each further
+                resolution or batch size pays a one-time recompilation
+                cost on its first request.
+            mode_of_compilation_of_unet: The ``torch.compile`` mode.  The
+                default ``"default"`` avoids CUDA graph capture, which is
+                bound to the thread that recorded the graph, whereas
+                inference is dispatched to whichever worker thread of the
+                executor is free.
+            name_of_scheduler: ``"dpm_solver_multistep"`` replaces the
+                scheduler saved with the model by DPM-Solver++, which
+                reaches comparable quality in roughly half the denoising
+                steps.  ``"default"`` keeps the scheduler saved with the
+                model.
+            quantisation_of_unet: ``"int8"`` loads the U-Net weights as
+                8-bit integers through ``bitsandbytes`` on CUDA devices,
+                halving the weight memory and bandwidth of the dominant
+                model component.  The text encoder, VAE, and safety checker
+                stay at half precision.  ``"none"`` (the default) loads
+                the U-Net unquantised.  Ignored on CPU, where
+                ``bitsandbytes`` 8-bit kernels are unavailable.  A
+                quantised U-Net is neither converted to channels-last nor
+                compiled, since neither operation supports the
+                ``bitsandbytes`` linear layers.
         """
         device = cls._resolve_device(device_preference)
-        torch_data_type = torch.float16 if device.type == "cuda" else torch.float32
+        if device.type == "cuda":
+            cls._configure_backends_of_torch_for_inference_on_cuda()
+        else:
+            cls._configure_threads_of_torch_for_inference_on_cpu(number_of_concurrency_slots)
+        torch_data_type = cls._select_torch_data_type(device)
 
         logger.info(
             "stable_diffusion_pipeline_loading",
@@ -229,17 +390,74 @@ class StableDiffusionPipeline:
         if not enable_safety_checker:
             keyword_arguments_for_pipeline["safety_checker"] = None
 
+        unet_is_quantised = quantisation_of_unet == "int8" and device.type == "cuda"
+        if unet_is_quantised:
+            keyword_arguments_for_pipeline["unet"] = diffusers.UNet2DConditionModel.from_pretrained(
+                model_id,
+                subfolder="unet",
+                revision=model_revision,
+                torch_dtype=torch_data_type,
+                quantization_config=diffusers.BitsAndBytesConfig(load_in_8bit=True),
+            )
+
         pipeline = diffusers.StableDiffusionPipeline.from_pretrained(
             model_id,
             **keyword_arguments_for_pipeline,
         )
         pipeline = pipeline.to(device)
 
-        # Enable attention slicing to reduce peak GPU memory consumption
-        # during inference.  This trades a small amount of inference speed
-        # for significantly lower VRAM usage, which is appropriate for the
-        # target deployment profile (single-GPU hosts with limited VRAM).
-        pipeline.enable_attention_slicing()
+        # Each U-Net forward pass dominates inference latency, so the
+        # number of denoising steps is the primary latency lever.  The
+        # multistep DPM-Solver++ scheduler reaches the quality of the PNDM
+        # scheduler saved with Stable Diffusion v1.5 in roughly half the
+        # steps.  Building it from the saved scheduler configuration
+        # preserves the model's noise schedule.
+        if name_of_scheduler == "dpm_solver_multistep":
+            pipeline.scheduler = diffusers.DPMSolverMultistepScheduler.from_config(pipeline.scheduler.config)
+
+        # Convolutions dominate Stable Diffusion latency.  On CUDA devices,
+        # the channels-last (NHWC) memory format lets cuDNN dispatch to
+        # kernels that map onto Tensor Cores more efficiently than the
+        # default NCHW layout.  The conversion must precede compilation so
+        # that the compiled graph is specialised for the NHWC strides.
+        if device.type == "cuda":
+            if not unet_is_quantised:
+                pipeline.unet.to(memory_format=torch.channels_last)
+            pipeline.vae.to(memory_format=torch.channels_last)
+
+        # PyTorch's fused scaled dot-product attention (flash and
+        # memory-efficient backends) both lowers peak memory and reduces
+        # latency relative to attention slicing, which computes attention
+        # one slice at a time.  Attention slicing is retained on CPU (where
+        # the fused CUDA kernels are unavailable and RAM is the binding
+        # constraint) and on GPUs too small to hold the unsliced attention
+        # activations.  The decision is based on the total (not free) VRAM
+        # so that every pool instance is configured identically, regardless
+        # of how much memory earlier instances have already claimed.
+        use_scaled_dot_product_attention = (
+            device.type == "cuda"
+            and torch.cuda.mem_get_info(device)[1] >= _MINIMUM_NUMBER_OF_BYTES_OF_VRAM_FOR_SCALED_DOT_PRODUCT_ATTENTION
+        )
+        if use_scaled_dot_product_attention:
+            pipeline.unet.set_attn_processor(diffusers.models.attention_processor.AttnProcessor2_0())
+        else:
+            pipeline.enable_attention_slicing()
+
+        # Multi-image requests are generated as a single batch on CUDA
+        # (see ``_run_inference``).  VAE slicing decodes the batched latents
+        # one image at a time, so the peak memory of the VAE decoder, the
+        # largest activation in the pipeline at high resolutions, does not
+        # grow with the batch size.
+        if device.type == "cuda":
+            pipeline.enable_vae_slicing()
+
+        unet_is_compiled = enable_compilation_of_unet and device.type == "cuda" and not unet_is_quantised
+        if unet_is_compiled:
+            pipeline.unet = torch.compile(
+                pipeline.unet,
+                mode=mode_of_compilation_of_unet,
+                fullgraph=True,
+            )
 
         pipeline_loading_duration_in_milliseconds = round(
             (time.monotonic() - pipeline_loading_start_time) * 1000,
@@ -250,6 +468,12 @@ class StableDiffusionPipeline:
             "stable_diffusion_pipeline_loaded",
             device=str(device),
             duration_in_milliseconds=pipeline_loading_duration_in_milliseconds,
+            name_of_scheduler=name_of_scheduler,
+            unet_compiled=unet_is_compiled,
+            unet_quantised=unet_is_quantised,
+            attention_implementation=(
+                "scaled_dot_product_attention" if use_scaled_dot_product_attention else "attention_slicing"
+            ),
             slot_index=slot_index,
         )
 
@@ -260,6 +484,7 @@ class StableDiffusionPipeline:
             number_of_inference_steps=number_of_inference_steps,
             guidance_scale=guidance_scale,
             inference_timeout_per_baseline_unit_in_seconds=inference_timeout_per_baseline_unit_in_seconds,
+            unet_is_compiled=unet_is_compiled,
         )
 
     async def run_startup_warmup(self) -> None:
@@ -291,26 +516,57 @@ class StableDiffusionPipeline:
           one-time initialisations.
         - **guidance_scale=1.0** — disables classifier-free guidance to
           skip the unconditional forward pass, halving the computation.
+
+        When the U-Net is compiled, these shortcuts would compile a graph
+        for a latent shape (and, without classifier-free guidance, a batch
+        size) that no real request uses, leaving the first real request to
+        pay the full compilation.  The warmup then runs at 512×512 with the
+        configured number of steps and guidance scale instead.  It still
+        generates a single image, so on CUDA, where a multi-image request
+        is generated as one batch, each other batch size is compiled
+        lazily on the first request that uses it.
         """
         warmup_start_time = time.monotonic()
 
+        if self._unet_is_compiled:
+            side_length_of_warmup_image = _SIDE_LENGTH_OF_WARMUP_IMAGE_FOR_COMPILED_UNET
+            number_of_inference_steps_of_warmup = self._number_of_inference_steps
+            guidance_scale_of_warmup = self._guidance_scale
+        else:
+            side_length_of_warmup_image = 64
+            number_of_inference_steps_of_warmup = 1
+            guidance_scale_of_warmup = 1.0
+
         try:
             random_number_generator = torch.Generator(device="cpu").manual_seed(0)
 
-            event_loop = asyncio.get_running_loop()
-            warmup_result: object = await event_loop.run_in_executor(
-                self._thread_pool_executor_for_inference,
-                functools.partial(  # type: ignore[misc, operator, arg-type]
-                    self._pipeline,  # type: ignore[arg-type]
+            # The warmup runs during the lifespan startup sequence, before
+            # the application accepts any traffic, so the forward pass is
+            # invoked directly on the event loop thread.  Dispatching it to
+            # the thread pool executor would add a thread handoff without
+            # protecting any in-flight request from event loop starvation.
+            # It runs under ``inference_mode`` exactly as ``_run_inference``
+            # does: the guards of a compiled U-Net include the grad and
+            # inference mode, so a warmup outside it would compile a graph
+            # that the first real request could not reuse.
+            with torch.inference_mode():
+                warmup_result: object = self._pipeline(  # type: ignore[operator]
                     prompt="warmup",
-                    width=64,
-                    height=64,
+                    width=side_length_of_warmup_image,
+                    height=side_length_of_warmup_image,
                     num_images_per_prompt=1,
-                    num_inference_steps=1,
-                    guidance_scale=1.0,
+                    num_inference_steps=number_of_inference_steps_of_warmup,
+                    guidance_scale=guidance_scale_of_warmup,
                     generator=random_number_generator,
-                ),
-            )
+                )
+
+            # CUDA kernels are launched asynchronously, so the host returns
+            # from the forward pass before the device has finished.  Wait
+            # for the device before reading the clock so that the reported
+            # warmup latency includes device-side execution time rather
+            # than kernel launch overhead alone.
+            if self._inference_device_is_cuda:
+                torch.cuda.synchronize()
 
             # Discard the output immediately to free memory.
             del warmup_result
@@ -428,17 +684,20 @@ class StableDiffusionPipeline:
 
         event_loop = asyncio.get_running_loop()
 
+        in_flight_inference = self._thread_pool_executor_for_inference.submit(
+            self._run_inference,
+            prompt,
+            image_width,
+            image_height,
+            number_of_images,
+            seed,
+        )
+        self._in_flight_inferences.add(in_flight_inference)
+        in_flight_inference.add_done_callback(self._in_flight_inferences.discard)
+
         try:
             output_from_inference = await asyncio.wait_for(
-                event_loop.run_in_executor(
-                    self._thread_pool_executor_for_inference,
-                    self._run_inference,
-                    prompt,
-                    image_width,
-                    image_height,
-                    number_of_images,
-                    seed,
-                ),
+                asyncio.wrap_future(in_flight_inference),
                 timeout=timeout_in_seconds,
             )
         except TimeoutError as timeout_error:
@@ -575,13 +834,21 @@ class StableDiffusionPipeline:
         to enable reproducible image generation.  Seed 0 is a valid
         deterministic seed with no special semantics.
 
-        When ``number_of_images`` is greater than 1, the pipeline is called
-        once per image with ``num_images_per_prompt=1`` and a freshly seeded
-        generator each time.  This guarantees that all images in a batch
-        with a fixed seed are byte-for-byte identical, as required by the
-        specification (RO3 step 12).  Passing a single generator to
-        ``num_images_per_prompt=n`` would cause the generator state to
-        advance between images, producing distinct outputs.
+        All images in a batch with a fixed seed must be byte-for-byte
+        identical, as required by the specification (RO3 step 12).  Passing
+        a single generator to ``num_images_per_prompt=n`` would cause the
+        generator state to advance between images, producing distinct
+        outputs, so each image receives its own identically seeded
+        generator.
+
+        On CUDA devices, all images are generated in a single batched
+        pipeline call with a list of identically seeded generators, one
+        per image.  Each U-Net step then streams the weights once for the
+        whole batch rather than once per image, which raises throughput
+        for memory-bandwidth-bound steps.  On CPU, where inference is
+        compute-bound and batching brings no throughput gain but
+        multiplies peak activation memory, the pipeline is called once per
+        image with ``num_images_per_prompt=1``.
 
         Args:
             prompt: The text prompt describing the desired image.
@@ -594,30 +861,72 @@ class StableDiffusionPipeline:
             A ``StableDiffusionPipelineOutput`` containing the generated
             images and optional content safety detection flags.
         """
-        all_images: list = []
-        all_nsfw_flags: list[bool] = []
-
-        for _ in range(number_of_images):
-            random_number_generator = torch.Generator(device="cpu").manual_seed(seed)
-
-            single_result = self._pipeline(  # type: ignore[operator]
-                prompt=prompt,
-                width=image_width,
-                height=image_height,
-                num_images_per_prompt=1,
-                num_inference_steps=self._number_of_inference_steps,
-                guidance_scale=self._guidance_scale,
-                generator=random_number_generator,
-            )
-            all_images.extend(single_result.images)  # type: ignore[union-attr]
-            nsfw_flags_for_single_result: list[bool] = getattr(single_result, "nsfw_content_detected", None) or [False]
-            all_nsfw_flags.extend(nsfw_flags_for_single_result)
+        # ``inference_mode`` additionally skips the version-counter and
+        # view tracking that the pipeline's own ``no_grad`` still performs.
+        with torch.inference_mode():
+            if self._inference_device_is_cuda:
+                return self._pipeline(  # type: ignore[operator, no-any-return]
+                    prompt=prompt,
+                    width=image_width,
+                    height=image_height,
+                    num_images_per_prompt=number_of_images,
+                    num_inference_steps=self._number_of_inference_steps,
+                    guidance_scale=self._guidance_scale,
+                    generator=self._create_seeded_random_number_generators(seed, number_of_images),
+                )
+
+            all_images: list = []
+            all_nsfw_flags: list[bool] = []
+
+            for _ in range(number_of_images):
+                (random_number_generator,) = self._create_seeded_random_number_generators(seed, 1)
+
+                single_result = self._pipeline(  # type: ignore[operator]
+                    prompt=prompt,
+                    width=image_width,
+                    height=image_height,
+                    num_images_per_prompt=1,
+                    num_inference_steps=self._number_of_inference_steps,
+                    guidance_scale=self._guidance_scale,
+                    generator=random_number_generator,
+                )
+                all_images.extend(single_result.images)  # type: ignore[union-attr]
+                nsfw_flags_for_single_result: list[bool] = getattr(single_result, "nsfw_content_detected", None) or [
+                    False
+                ]
+                all_nsfw_flags.extend(nsfw_flags_for_single_result)
 
         return diffusers.pipelines.stable_diffusion.StableDiffusionPipelineOutput(  # type: ignore[no-any-return]
             images=all_images,
             nsfw_content_detected=all_nsfw_flags,
         )
 
+    @staticmethod
+    def _create_seeded_random_number_generators(seed: int, number_of_generators: int) -> list[torch.Generator]:
+        """
+        Return ``number_of_generators`` new CPU generators, each seeded
+        with ``seed``.
+
+        Generators are created on the CPU (rather than on the inference
+        device) so that a given seed produces the same initial latents on
+        every device.
+
+        Fresh generators are allocated for every call rather than reused
+        across calls.  An inference that exceeds its timeout keeps running
+        in its executor thread after the pipeline instance has returned to
+        the pool, so reseeding a shared generator for the next request
+        would corrupt the random stream of the orphaned inference, and
+        vice versa.
+
+        Args:
+            seed: Integer seed applied to every returned generator.
+            number_of_generators: Number of generators required.
+
+        Returns:
+            A list of identically seeded generators.
+        """
+        return [torch.Generator(device="cpu").manual_seed(seed) for _ in range(number_of_generators)]
+
     @staticmethod
     def _encode_images_to_base64(
         output_images: list,
@@ -630,8 +939,9 @@ class StableDiffusionPipeline:
         custom ``ThreadPoolExecutor`` via ``run_in_executor`` to prevent
         event loop starvation during large batch responses (spec §14).
 
-        Each non-flagged image is encoded as a PNG and then base64-encoded
-        using the standard alphabet (RFC 4648 §4).  Flagged images are
+        Each non-flagged image is encoded as a PNG (at a low zlib
+        compression level that favours encoding speed) and then
+        base64-encoded using the standard alphabet (RFC 4648 §4).  Flagged images are
         replaced with ``None`` to indicate content policy filtering.
 
         Args:
@@ -646,13 +956,28 @@ class StableDiffusionPipeline:
             content-safety-filtered images.
         """
         base64_encoded_images: list[str | None] = []
+        # A single buffer is rewound and reused for every image, so its
+        # backing allocation grows once to the size of the largest PNG
+        # instead of being rebuilt from empty for each image in the batch.
+        image_byte_buffer = io.BytesIO()
         for index, individual_output_image in enumerate(output_images):
             if index in indices_flagged_by_content_safety_checker:
                 base64_encoded_images.append(None)
             else:
-                image_byte_buffer = io.BytesIO()
-                individual_output_image.save(image_byte_buffer, format="PNG")
-                encoded_image = base64.b64encode(image_byte_buffer.getvalue()).decode("utf-8")
+                image_byte_buffer.seek(0)
+                image_byte_buffer.truncate()
+                individual_output_image.save(
+                    image_byte_buffer,
+                    format="PNG",
+                    compress_level=_COMPRESSION_LEVEL_OF_PNG_ENCODING,
+                )
+                # ``getbuffer`` exposes the buffer's memory as a zero-copy
+                # view, whereas ``getvalue`` would first copy the whole PNG
+                # into a new ``bytes`` object before base64 encoding.  The
+                # view must be released before the buffer is truncated for
+                # the next image, hence the context manager.
+                with image_byte_buffer.getbuffer() as view_of_png_bytes:
+                    encoded_image = base64.b64encode(view_of_png_bytes).decode("ascii")
                 base64_encoded_images.append(encoded_image)
         return base64_encoded_images
 
@@ -670,7 +995,7 @@ class StableDiffusionPipeline:
         the OS out-of-memory killer after 3–5 inference cycles on 8 GB RAM.
         """
         gc.collect()
-        if self._device.type == "cuda":
+        if self._inference_device_is_cuda:
             torch.cuda.empty_cache()
 
     def check_health(self) -> bool:
@@ -690,14 +1015,59 @@ class StableDiffusionPipeline:
         This method must be called during application shutdown to release
         the substantial memory (GPU VRAM and/or CPU RAM) occupied by the
         loaded model weights.
+
+        An inference that exceeded its timeout keeps running in its
+        executor thread after the request has failed, and detaching the
+        sub-modules under it would fail it part-way through.  The inferences
+        of this instance that are still running are therefore given up to
+        ``_MAXIMUM_WAIT_FOR_IN_FLIGHT_INFERENCES_ON_CLOSE_IN_SECONDS`` to
+        finish first; a hung inference is logged and abandoned so that it
+        cannot stall the shutdown.  The executor itself is shared by every
+        pool instance and is shut down by the application lifespan.
+
+        The weight-bearing sub-modules are detached from the pipeline
+        before it is dropped, so that a reference held elsewhere (for
+        example by a ``torch.compile`` wrapper around the U-Net, or by a
+        lingering reference to the pipeline object) cannot keep the
+        weights alive.  A garbage collection pass then breaks any
+        reference cycles before the CUDA caching allocator is asked to
+        return its blocks to the device.  The memory release blocks, so it
+        runs in a worker thread to keep the event loop responsive during
+        shutdown.
         """
         if not hasattr(self, "_pipeline"):
             return
+        if self._in_flight_inferences:
+            _, inferences_still_running = await asyncio.wait(
+                [asyncio.wrap_future(in_flight_inference) for in_flight_inference in tuple(self._in_flight_inferences)],
+                timeout=_MAXIMUM_WAIT_FOR_IN_FLIGHT_INFERENCES_ON_CLOSE_IN_SECONDS,
+            )
+            if inferences_still_running:
+                logger.warning(
+                    "stable_diffusion_pipeline_released_with_inference_in_flight",
+                    number_of_inferences_in_flight=len(inferences_still_running),
+                    maximum_wait_in_seconds=_MAXIMUM_WAIT_FOR_IN_FLIGHT_INFERENCES_ON_CLOSE_IN_SECONDS,
+                )
+        pipeline = self._pipeline
         del self._pipeline
-        if self._device.type == "cuda":
-            torch.cuda.empty_cache()
+        for name_of_sub_module in _NAMES_OF_SUB_MODULES_RELEASED_ON_CLOSE:
+            if getattr(pipeline, name_of_sub_module, None) is not None:
+                setattr(pipeline, name_of_sub_module, None)
+        del pipeline
+        await asyncio.to_thread(self._release_memory_of_device)
         logger.info("stable_diffusion_pipeline_released")
 
+    def _release_memory_of_device(self) -> None:
+        """
+        Collect the released model weights and, on CUDA devices, return the
+        cached blocks of the allocator to the device.
+        """
+        gc.collect()
+        if self._inference_device_is_cuda:
+            torch.cuda.synchronize()
+            torch.cuda.empty_cache()
+            torch.cuda.ipc_collect()
+
 
 class ImageGenerationResult:
     """
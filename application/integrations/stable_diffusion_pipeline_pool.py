@@ -118,8 +118,10 @@ class StableDiffusionPipelinePool:
         """
         Close all pipeline instances in the pool and free GPU memory.
 
-        This method drains the queue and calls ``close()`` on each instance.
-        It must be called during application shutdown to release the
+        This method drains the queue and calls ``close()`` on each instance,
+        which first waits, for a bounded time, for any of its inferences
+        that is still running (for example, one that exceeded its timeout)
+        to finish.  It must be called during application shutdown to release the
         substantial memory (GPU VRAM and/or CPU RAM) occupied by the loaded
         model weights.
         """
@@ -57,6 +57,12 @@ def configure_logging(log_level: str = "INFO") -> None:
     twelve-factor app methodology (factor XI — Logs) as required by
     the v5.12.0 specification (Section 18).
 
+    Structlog-native loggers are wrapped in a filtering bound logger
+    for the configured level, whose methods below that level are no-ops.
+    A disabled log call therefore returns immediately instead of
+    building an event dictionary and running the processor chain only
+    for the standard library logger to discard the record.
+
     Should be called once during application startup, before any log
     messages are emitted.
     """
@@ -77,7 +83,7 @@ def configure_logging(log_level: str = "INFO") -> None:
             structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         cache_logger_on_first_use=True,
     )
 
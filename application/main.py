@@ -112,6 +112,9 @@ def create_application() -> fastapi.FastAPI:
                 application_configuration.maximum_number_of_bytes_of_response_body_from_large_language_model
             ),
             circuit_breaker=circuit_breaker_for_large_language_model,
+            maximum_number_of_entries_in_cache_of_enhanced_prompts=(
+                application_configuration.maximum_number_of_entries_in_cache_of_enhanced_prompts
+            ),
         )
 
         # ── Custom thread pool executor (spec §14) ────────────────────
@@ -175,10 +178,14 @@ def create_application() -> fastapi.FastAPI:
                             application_configuration.number_of_inference_steps_of_stable_diffusion
                         ),
                         guidance_scale=(application_configuration.guidance_scale_of_stable_diffusion),
+                        name_of_scheduler=(application_configuration.scheduler_of_stable_diffusion),
+                        quantisation_of_unet=(application_configuration.quantisation_of_unet_of_stable_diffusion),
                         inference_timeout_per_baseline_unit_in_seconds=(
                             application_configuration.inference_timeout_by_stable_diffusion_per_baseline_unit_in_seconds
                         ),
                         slot_index=slot_index,
+                        number_of_concurrency_slots=number_of_concurrency_slots,
+                        enable_compilation_of_unet=(application_configuration.compilation_of_unet_for_stable_diffusion),
                     )
                 )
         except Exception as model_loading_error:
@@ -223,6 +230,12 @@ def create_application() -> fastapi.FastAPI:
         for pipeline_instance_to_warm_up in loaded_pipeline_instances:
             await pipeline_instance_to_warm_up.run_startup_warmup()
 
+        # Open the llama.cpp connections only after model loading and the
+        # inference warmup, which can take minutes, so that the idle
+        # keep-alive connections are not closed by the server's keep-alive
+        # timeout before the first request arrives.
+        await instance_of_prompt_enhancement_service.warm_up_connection_pool()
+
         # ── ImageGenerationService construction ──────────────────────
         #
         # The ImageGenerationService wraps the StableDiffusionPipelinePool
@@ -318,10 +331,13 @@ def create_application() -> fastapi.FastAPI:
 
     application.api.error_handlers.register_error_handlers(fastapi_application)
 
+    # The allowed origins are passed as a frozenset because Starlette's
+    # CORSMiddleware checks each request's Origin header with a plain
+    # ``in`` test, which is a linear scan on the configured list.
     if application_configuration.cors_allowed_origins:
         fastapi_application.add_middleware(
             fastapi.middleware.cors.CORSMiddleware,
-            allow_origins=application_configuration.cors_allowed_origins,
+            allow_origins=frozenset(application_configuration.cors_allowed_origins),
             allow_methods=["GET", "POST"],
             allow_headers=["Content-Type", "Accept"],
             expose_headers=["X-Correlation-ID"],
@@ -22,6 +22,9 @@ instruments:
 - ``counter_of_number_of_generated_images_rejected_by_safety_filter``:
   A ``Counter`` tracking the total number of generated images rejected
   by the NSFW safety checker.
+- ``counter_of_lookups_in_cache_of_enhanced_prompts``: A ``Counter``
+  tracking lookups in the cache of enhanced prompts, labelled by result
+  (hit or miss).
 
 The custom registry avoids exposing default Python process metrics that
 are not specified by the application specification.
@@ -77,3 +80,10 @@ counter_of_number_of_generated_images_rejected_by_safety_filter = prometheus_cli
     "Total number of generated images rejected by the NSFW safety checker",
     registry=registry_for_prometheus_metrics,
 )
+
+counter_of_lookups_in_cache_of_enhanced_prompts = prometheus_client.Counter(
+    "number_of_lookups_in_cache_of_enhanced_prompts_total",
+    "Total number of lookups in the cache of enhanced prompts",
+    ["result"],
+    registry=registry_for_prometheus_metrics,
+)
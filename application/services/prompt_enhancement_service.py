@@ -57,6 +57,15 @@ class PromptEnhancementService:
             original_prompt=original_prompt,
         )
 
+    async def warm_up_connection_pool(self) -> None:
+        """
+        Open the connections to the llama.cpp server ahead of the first
+        real request.
+
+        Delegates to ``LlamaCppClient.warm_up_connection_pool()``.
+        """
+        await self._llama_cpp_client.warm_up_connection_pool()
+
     async def check_health(self) -> bool:
         """
         Check whether the llama.cpp server is reachable.
@@ -18,6 +18,12 @@ class TestHealthEndpoints:
         assert response.status_code == 200
         assert response.json() == {"status": "healthy"}
 
+    @pytest.mark.asyncio
+    async def test_health_has_json_content_type(self, client):
+        response = await client.get("/health")
+
+        assert response.headers.get("content-type") == "application/json"
+
     @pytest.mark.asyncio
     async def test_health_has_correlation_id(self, client):
         response = await client.get("/health")
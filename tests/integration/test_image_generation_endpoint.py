@@ -10,9 +10,7 @@ Covers:
 - Admission control rejection (429 ``service_busy`` with ``Retry-After``).
 """
 
-import asyncio
 import collections.abc
-from unittest.mock import AsyncMock
 
 import fastapi
 import httpx
@@ -219,9 +217,7 @@ class TestImageGenerationEndpoint:
                 indices_flagged_by_content_safety_checker=[1, 3],
             )
         )
-        mock_of_stable_diffusion_pipeline.generate_images = AsyncMock(
-            return_value=generation_result_with_content_safety_flags,
-        )
+        mock_of_stable_diffusion_pipeline.generate_images.return_value = generation_result_with_content_safety_flags
 
         response = await client.post(
             "/v1/images/generations",
@@ -277,8 +273,8 @@ class TestImageGenerationEndpoint:
                 indices_flagged_by_content_safety_checker=[1],
             )
         )
-        mock_of_stable_diffusion_pipeline.generate_images = AsyncMock(
-            return_value=single_generation_result_with_content_safety_flag,
+        mock_of_stable_diffusion_pipeline.generate_images.return_value = (
+            single_generation_result_with_content_safety_flag
         )
 
         response = await client.post(
@@ -346,79 +342,40 @@ class TestImageGenerationEndpoint:
         assert response.status_code == 200
 
     @pytest.mark.asyncio
-    async def test_response_format_url_rejected(self, client) -> None:
-        response = await client.post(
-            "/v1/images/generations",
-            json={"prompt": "A sunset", "response_format": "url"},
-        )
-
-        assert response.status_code == 400
-
-    @pytest.mark.asyncio
-    async def test_invalid_size(self, client) -> None:
-        response = await client.post(
-            "/v1/images/generations",
-            json={"prompt": "A sunset", "size": "999x999"},
-        )
-
-        assert response.status_code == 400
-        assert response.json()["error"]["code"] == "request_validation_failed"
-        assert "X-Correlation-ID" in response.headers
-
-    @pytest.mark.asyncio
-    async def test_256x256_rejected(self, client) -> None:
-        response = await client.post(
-            "/v1/images/generations",
-            json={"prompt": "A sunset", "size": "256x256"},
-        )
-
-        assert response.status_code == 400
-        assert response.json()["error"]["code"] == "request_validation_failed"
-        assert "X-Correlation-ID" in response.headers
-
-    @pytest.mark.asyncio
-    async def test_invalid_n(self, client) -> None:
-        response = await client.post(
-            "/v1/images/generations",
-            json={"prompt": "A sunset", "n": 0},
-        )
-
-        assert response.status_code == 400
-        assert response.json()["error"]["code"] == "request_validation_failed"
-        assert "X-Correlation-ID" in response.headers
-
-    @pytest.mark.asyncio
-    async def test_missing_prompt(self, client) -> None:
-        response = await client.post(
-            "/v1/images/generations",
-            json={},
-        )
-
-        assert response.status_code == 400
-        assert response.json()["error"]["code"] == "request_validation_failed"
-        assert "X-Correlation-ID" in response.headers
-
-    @pytest.mark.asyncio
-    async def test_whitespace_only_prompt(self, client) -> None:
-        response = await client.post(
-            "/v1/images/generations",
-            json={"prompt": "   "},
-        )
-
-        assert response.status_code == 400
-        assert response.json()["error"]["code"] == "request_validation_failed"
-        assert "X-Correlation-ID" in response.headers
-
-    @pytest.mark.asyncio
-    async def test_extra_fields_rejected(self, client) -> None:
+    @pytest.mark.parametrize(
+        "request_body",
+        [
+            pytest.param({"prompt": "A sunset", "response_format": "url"}, id="response_format_url"),
+            pytest.param({"prompt": "A sunset", "size": "999x999"}, id="invalid_size"),
+            pytest.param({"prompt": "A sunset", "size": "256x256"}, id="size_256x256"),
+            pytest.param({"prompt": "A sunset", "n": 0}, id="invalid_n"),
+            pytest.param({}, id="missing_prompt"),
+            pytest.param({"prompt": "   "}, id="whitespace_only_prompt"),
+            pytest.param({"prompt": "A sunset", "foo": "bar"}, id="extra_field"),
+            pytest.param({"prompt": "A sunset", "seed": -1}, id="negative_seed"),
+            pytest.param({"prompt": "A sunset", "seed": 4_294_967_296}, id="seed_above_maximum"),
+        ],
+    )
+    async def test_invalid_request_body_rejected(
+        self,
+        client,
+        mock_of_stable_diffusion_pipeline,
+        request_body,
+    ) -> None:
+        """
+        Every request body that violates the image generation schema is
+        rejected with HTTP 400 and the ``request_validation_failed`` code
+        before the pipeline is invoked.
+        """
         response = await client.post(
             "/v1/images/generations",
-            json={"prompt": "A sunset", "foo": "bar"},
+            json=request_body,
         )
 
         assert response.status_code == 400
         assert response.json()["error"]["code"] == "request_validation_failed"
         assert "X-Correlation-ID" in response.headers
+        mock_of_stable_diffusion_pipeline.generate_images.assert_not_awaited()
 
     @pytest.mark.asyncio
     async def test_service_unavailable(self, client, mock_of_stable_diffusion_pipeline) -> None:
@@ -477,24 +434,6 @@ class TestImageGenerationEndpoint:
         assert body["error"]["code"] == "upstream_service_unavailable"
         mock_of_stable_diffusion_pipeline.generate_images.assert_not_awaited()
 
-    @pytest.mark.asyncio
-    async def test_seed_negative_rejected(self, client) -> None:
-        response = await client.post(
-            "/v1/images/generations",
-            json={"prompt": "A sunset", "seed": -1},
-        )
-
-        assert response.status_code == 400
-
-    @pytest.mark.asyncio
-    async def test_seed_above_maximum_rejected(self, client) -> None:
-        response = await client.post(
-            "/v1/images/generations",
-            json={"prompt": "A sunset", "seed": 4_294_967_296},
-        )
-
-        assert response.status_code == 400
-
 
 class TestServiceBusyErrorHandler:
     """
@@ -526,10 +465,10 @@ class TestServiceBusyErrorHandler:
     ) -> collections.abc.AsyncGenerator:
         """
         Build a test application with an admission controller set to
-        ``maximum_number_of_concurrent_operations=1``.  The fixture holds the single slot
-        occupied via a background task, ensuring that any image
-        generation request during the test will be rejected with
-        ``ServiceBusyError``.
+        ``maximum_number_of_concurrent_operations=1``.  The fixture acquires
+        the single slot before yielding the client and holds it until
+        teardown, ensuring that any image generation request during the
+        test will be rejected with ``ServiceBusyError``.
         """
         admission_controller = application.admission_control.AdmissionControllerForImageGeneration(
             maximum_number_of_concurrent_operations=1,
@@ -571,22 +510,10 @@ class TestServiceBusyErrorHandler:
         test_application.state.retry_after_busy_in_seconds = 45
 
         # Occupy the single admission slot for the duration of the test.
-        hold_slot_signal = asyncio.Event()
-
-        async def hold_admission_slot() -> None:
-            async with admission_controller.acquire_or_reject():
-                await hold_slot_signal.wait()
-
-        background_task = asyncio.create_task(hold_admission_slot())
-        await asyncio.sleep(0)  # Let the task acquire the slot.
-
-        transport = httpx.ASGITransport(app=test_application)
-        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as http_client:
-            yield http_client
-
-        # Release the background task.
-        hold_slot_signal.set()
-        await background_task
+        async with admission_controller.acquire_or_reject():
+            transport = httpx.ASGITransport(app=test_application)
+            async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as http_client:
+                yield http_client
 
     @pytest.mark.asyncio
     async def test_returns_http_429_when_concurrency_limit_reached(
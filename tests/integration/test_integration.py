@@ -55,6 +55,7 @@ def _build_mock_of_llama_cpp_client():
     )
     service.enhance_prompt = AsyncMock(return_value="Enhanced prompt text")
     service.check_health = AsyncMock(return_value=True)
+    service.warm_up_connection_pool = AsyncMock()
     service.close = AsyncMock()
     return service
 
@@ -78,11 +79,15 @@ def _apply_default_configuration_attributes(mock_configuration_instance):
     )
     mock_configuration_instance.size_of_connection_pool_for_large_language_model = 10
     mock_configuration_instance.maximum_number_of_bytes_of_response_body_from_large_language_model = 1_048_576
+    mock_configuration_instance.maximum_number_of_entries_in_cache_of_enhanced_prompts = 0
     mock_configuration_instance.id_of_stable_diffusion_model = "test-model"
     mock_configuration_instance.revision_of_stable_diffusion_model = "main"
     mock_configuration_instance.stable_diffusion_device = "cpu"
     mock_configuration_instance.safety_checker_for_stable_diffusion = True
-    mock_configuration_instance.number_of_inference_steps_of_stable_diffusion = 20
+    mock_configuration_instance.compilation_of_unet_for_stable_diffusion = False
+    mock_configuration_instance.number_of_inference_steps_of_stable_diffusion = 12
+    mock_configuration_instance.scheduler_of_stable_diffusion = "dpm_solver_multistep"
+    mock_configuration_instance.quantisation_of_unet_of_stable_diffusion = "none"
     mock_configuration_instance.guidance_scale_of_stable_diffusion = 7.0
     mock_configuration_instance.inference_timeout_by_stable_diffusion_per_baseline_unit_in_seconds = 10.0
     mock_configuration_instance.maximum_number_of_concurrent_operations_of_image_generation = 2
@@ -205,6 +210,15 @@ class TestLifespan:
                     application.services.image_generation_service.ImageGenerationService,
                 )
 
+    @pytest.mark.asyncio
+    async def test_connection_pool_of_llama_cpp_warmed_up_on_startup(
+        self, mock_of_llama_cpp_client, mock_of_stable_diffusion_pipeline
+    ):
+        with _patched_services(mock_of_llama_cpp_client, mock_of_stable_diffusion_pipeline):
+            test_application = application.main.create_application()
+            async with test_application.router.lifespan_context(test_application):
+                mock_of_llama_cpp_client.warm_up_connection_pool.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_services_closed_on_shutdown(self, mock_of_llama_cpp_client, mock_of_stable_diffusion_pipeline):
         """Services must be closed when the lifespan exits."""
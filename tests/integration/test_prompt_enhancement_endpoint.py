@@ -80,73 +80,47 @@ class TestPromptEnhancementEndpoint:
         assert "X-Correlation-ID" in response.headers
 
     @pytest.mark.asyncio
-    async def test_empty_body(self, client) -> None:
-        response = await client.post(
-            "/v1/prompts/enhance",
-            json={},
-        )
-
-        assert response.status_code == 400
-        assert "X-Correlation-ID" in response.headers
-        body = response.json()
-        assert "code" in body["error"]
-        assert "message" in body["error"]
-
-    @pytest.mark.asyncio
-    async def test_empty_prompt(self, client) -> None:
-        response = await client.post(
-            "/v1/prompts/enhance",
-            json={"prompt": ""},
-        )
-
-        assert response.status_code == 400
-        assert response.json()["error"]["code"] == "request_validation_failed"
-        assert "X-Correlation-ID" in response.headers
-
-    @pytest.mark.asyncio
-    async def test_whitespace_only_prompt(self, client) -> None:
-        response = await client.post(
-            "/v1/prompts/enhance",
-            json={"prompt": "   "},
-        )
-
-        assert response.status_code == 400
-        assert response.json()["error"]["code"] == "request_validation_failed"
-        assert "X-Correlation-ID" in response.headers
-
-    @pytest.mark.asyncio
-    async def test_extra_fields_rejected(self, client) -> None:
+    @pytest.mark.parametrize(
+        "request_body",
+        [
+            pytest.param({}, id="empty_body"),
+            pytest.param({"prompt": ""}, id="empty_prompt"),
+            pytest.param({"prompt": "   "}, id="whitespace_only_prompt"),
+            pytest.param({"prompt": "A cat", "foo": "bar"}, id="extra_field"),
+        ],
+    )
+    async def test_invalid_request_body_rejected(self, client, mock_of_llama_cpp_client, request_body) -> None:
+        """
+        Every request body that violates the prompt enhancement schema is
+        rejected with HTTP 400 and the ``request_validation_failed`` code
+        before the large language model is called.
+        """
         response = await client.post(
             "/v1/prompts/enhance",
-            json={"prompt": "A cat", "foo": "bar"},
+            json=request_body,
         )
 
         assert response.status_code == 400
         assert response.json()["error"]["code"] == "request_validation_failed"
         assert "X-Correlation-ID" in response.headers
+        mock_of_llama_cpp_client.enhance_prompt.assert_not_awaited()
 
     @pytest.mark.asyncio
-    async def test_service_unavailable(self, client, mock_of_llama_cpp_client) -> None:
-        mock_of_llama_cpp_client.enhance_prompt.side_effect = (
-            application.exceptions.LargeLanguageModelServiceUnavailableError(detail="Server down")
-        )
-
-        response = await client.post(
-            "/v1/prompts/enhance",
-            json={"prompt": "A cat"},
-        )
-
-        assert response.status_code == 502
-        assert "X-Correlation-ID" in response.headers
-        body = response.json()
-        assert body["error"]["code"] == "upstream_service_unavailable"
-        assert "Server down" in body["error"]["message"]
-
-    @pytest.mark.asyncio
-    async def test_enhancement_error(self, client, mock_of_llama_cpp_client) -> None:
-        mock_of_llama_cpp_client.enhance_prompt.side_effect = application.exceptions.PromptEnhancementError(
-            detail="Malformed response"
-        )
+    @pytest.mark.parametrize(
+        "upstream_error",
+        [
+            pytest.param(
+                application.exceptions.LargeLanguageModelServiceUnavailableError(detail="Server down"),
+                id="service_unavailable",
+            ),
+            pytest.param(
+                application.exceptions.PromptEnhancementError(detail="Malformed response"),
+                id="enhancement_error",
+            ),
+        ],
+    )
+    async def test_upstream_failure_returns_502(self, client, mock_of_llama_cpp_client, upstream_error) -> None:
+        mock_of_llama_cpp_client.enhance_prompt.side_effect = upstream_error
 
         response = await client.post(
             "/v1/prompts/enhance",
@@ -157,7 +131,7 @@ class TestPromptEnhancementEndpoint:
         assert "X-Correlation-ID" in response.headers
         body = response.json()
         assert body["error"]["code"] == "upstream_service_unavailable"
-        assert "Malformed response" in body["error"]["message"]
+        assert upstream_error.detail in body["error"]["message"]
 
     @pytest.mark.asyncio
     async def test_unexpected_error(self, client, mock_of_llama_cpp_client) -> None:
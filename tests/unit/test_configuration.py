@@ -1,5 +1,7 @@
 """Tests for configuration.py — ApplicationConfiguration."""
 
+import importlib.util
+
 import pydantic
 import pytest
 
@@ -21,12 +23,16 @@ ALL_CONFIGURATION_ENVIRONMENT_VARIABLE_NAMES: list[str] = [
     "TEXT_TO_IMAGE_SYSTEM_PROMPT_FOR_LARGE_LANGUAGE_MODEL",
     "TEXT_TO_IMAGE_SIZE_OF_CONNECTION_POOL_FOR_LARGE_LANGUAGE_MODEL",
     "TEXT_TO_IMAGE_MAXIMUM_NUMBER_OF_BYTES_OF_RESPONSE_BODY_FROM_LARGE_LANGUAGE_MODEL",
+    "TEXT_TO_IMAGE_MAXIMUM_NUMBER_OF_ENTRIES_IN_CACHE_OF_ENHANCED_PROMPTS",
     "TEXT_TO_IMAGE_ID_OF_STABLE_DIFFUSION_MODEL",
     "TEXT_TO_IMAGE_REVISION_OF_STABLE_DIFFUSION_MODEL",
     "TEXT_TO_IMAGE_STABLE_DIFFUSION_DEVICE",
     "TEXT_TO_IMAGE_NUMBER_OF_INFERENCE_STEPS_OF_STABLE_DIFFUSION",
+    "TEXT_TO_IMAGE_SCHEDULER_OF_STABLE_DIFFUSION",
+    "TEXT_TO_IMAGE_QUANTISATION_OF_UNET_OF_STABLE_DIFFUSION",
     "TEXT_TO_IMAGE_GUIDANCE_SCALE_OF_STABLE_DIFFUSION",
     "TEXT_TO_IMAGE_SAFETY_CHECKER_FOR_STABLE_DIFFUSION",
+    "TEXT_TO_IMAGE_COMPILATION_OF_UNET_FOR_STABLE_DIFFUSION",
     "TEXT_TO_IMAGE_INFERENCE_TIMEOUT_BY_STABLE_DIFFUSION_PER_BASELINE_UNIT_IN_SECONDS",
     "TEXT_TO_IMAGE_MAXIMUM_NUMBER_OF_CONCURRENT_OPERATIONS_OF_IMAGE_GENERATION",
     "TEXT_TO_IMAGE_RETRY_AFTER_BUSY_IN_SECONDS",
@@ -76,14 +82,18 @@ class TestApplicationConfigurationDefaults:
         assert "enhancing text-to-image prompts" in application_configuration.system_prompt_for_large_language_model
         assert application_configuration.size_of_connection_pool_for_large_language_model == 10
         assert application_configuration.maximum_number_of_bytes_of_response_body_from_large_language_model == 1_048_576
+        assert application_configuration.maximum_number_of_entries_in_cache_of_enhanced_prompts == 0
 
         # ── Stable Diffusion settings ──
         assert application_configuration.id_of_stable_diffusion_model == "stable-diffusion-v1-5/stable-diffusion-v1-5"
         assert application_configuration.revision_of_stable_diffusion_model == "main"
         assert application_configuration.stable_diffusion_device == "auto"
-        assert application_configuration.number_of_inference_steps_of_stable_diffusion == 20
+        assert application_configuration.number_of_inference_steps_of_stable_diffusion == 12
+        assert application_configuration.scheduler_of_stable_diffusion == "dpm_solver_multistep"
+        assert application_configuration.quantisation_of_unet_of_stable_diffusion == "none"
         assert application_configuration.guidance_scale_of_stable_diffusion == 7.0
         assert application_configuration.safety_checker_for_stable_diffusion is True
+        assert application_configuration.compilation_of_unet_for_stable_diffusion is False
         assert application_configuration.inference_timeout_by_stable_diffusion_per_baseline_unit_in_seconds is None
 
         # ── Circuit breaker settings ──
@@ -294,6 +304,28 @@ class TestConfigurationValidation:
         with pytest.raises(pydantic.ValidationError):
             application.configuration.ApplicationConfiguration()
 
+    def test_unknown_scheduler_rejected(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TEXT_TO_IMAGE_SCHEDULER_OF_STABLE_DIFFUSION", "euler")
+        with pytest.raises(pydantic.ValidationError):
+            application.configuration.ApplicationConfiguration()
+
+    def test_unknown_quantisation_of_unet_rejected(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TEXT_TO_IMAGE_QUANTISATION_OF_UNET_OF_STABLE_DIFFUSION", "int4")
+        with pytest.raises(pydantic.ValidationError):
+            application.configuration.ApplicationConfiguration()
+
+    def test_int8_quantisation_of_unet_rejected_without_bitsandbytes(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TEXT_TO_IMAGE_QUANTISATION_OF_UNET_OF_STABLE_DIFFUSION", "int8")
+        monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+        with pytest.raises(pydantic.ValidationError, match="requires the bitsandbytes package"):
+            application.configuration.ApplicationConfiguration()
+
+    def test_int8_quantisation_of_unet_accepted_with_bitsandbytes(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TEXT_TO_IMAGE_QUANTISATION_OF_UNET_OF_STABLE_DIFFUSION", "int8")
+        monkeypatch.setattr(importlib.util, "find_spec", lambda name: object())
+        application_configuration = application.configuration.ApplicationConfiguration()
+        assert application_configuration.quantisation_of_unet_of_stable_diffusion == "int8"
+
     def test_zero_inference_steps_rejected(self, monkeypatch: pytest.MonkeyPatch) -> None:
         monkeypatch.setenv("TEXT_TO_IMAGE_NUMBER_OF_INFERENCE_STEPS_OF_STABLE_DIFFUSION", "0")
         with pytest.raises(pydantic.ValidationError):
@@ -331,6 +363,13 @@ class TestConfigurationValidation:
         with pytest.raises(pydantic.ValidationError):
             application.configuration.ApplicationConfiguration()
 
+    def test_negative_maximum_number_of_entries_in_cache_of_enhanced_prompts_rejected(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("TEXT_TO_IMAGE_MAXIMUM_NUMBER_OF_ENTRIES_IN_CACHE_OF_ENHANCED_PROMPTS", "-1")
+        with pytest.raises(pydantic.ValidationError):
+            application.configuration.ApplicationConfiguration()
+
     def test_zero_maximum_number_of_concurrent_operations_rejected(self, monkeypatch: pytest.MonkeyPatch) -> None:
         monkeypatch.setenv("TEXT_TO_IMAGE_MAXIMUM_NUMBER_OF_CONCURRENT_OPERATIONS_OF_IMAGE_GENERATION", "0")
         with pytest.raises(pydantic.ValidationError):
@@ -12,17 +12,20 @@ Covers all public methods and defensive handling paths:
 - HTTP client lifecycle (close).
 """
 
+import asyncio
 import json
 from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock
 
 import httpx
+import orjson
 import pytest
 import structlog.testing
 
 import application.circuit_breaker
 import application.exceptions
 import application.integrations.llama_cpp_client
+import application.prometheus_metrics
 
 
 def _build_llama_cpp_client(
@@ -30,6 +33,8 @@ def _build_llama_cpp_client(
     request_timeout_in_seconds: float = 30.0,
     maximum_number_of_bytes_of_response_body: int = 1_048_576,
     circuit_breaker: application.circuit_breaker.CircuitBreaker | None = None,
+    temperature: float = 0.7,
+    maximum_number_of_entries_in_cache_of_enhanced_prompts: int = 0,
 ) -> application.integrations.llama_cpp_client.LlamaCppClient:
     """
     Create a LlamaCppClient instance with configurable parameters.
@@ -40,12 +45,17 @@ def _build_llama_cpp_client(
     The ``circuit_breaker`` parameter allows tests to inject a circuit
     breaker instance for verifying the integration between the service
     and the circuit breaker pattern.
+
+    The ``temperature`` and ``maximum_number_of_entries_in_cache_of_enhanced_prompts``
+    parameters control whether the cache of enhanced prompts is enabled.
     """
     return application.integrations.llama_cpp_client.LlamaCppClient(
         base_url_of_large_language_model_server=base_url,
         request_timeout_in_seconds=request_timeout_in_seconds,
         maximum_number_of_bytes_of_response_body=maximum_number_of_bytes_of_response_body,
         circuit_breaker=circuit_breaker,
+        temperature=temperature,
+        maximum_number_of_entries_in_cache_of_enhanced_prompts=(maximum_number_of_entries_in_cache_of_enhanced_prompts),
     )
 
 
@@ -166,6 +176,43 @@ class TestEnhancePrompt:
         assert result == "Enhanced prompt text"
         service.http_client.stream.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_request_body_is_serialised_as_json_bytes(self):
+        service = _build_llama_cpp_client()
+        mock_response = _build_mock_of_json_streaming_response("Enhanced prompt text")
+        _configure_stream_mock(service, mock_response)
+
+        await service.enhance_prompt("A cat")
+
+        keyword_arguments_of_stream_call = service.http_client.stream.call_args.kwargs
+        assert keyword_arguments_of_stream_call["headers"] == {"Content-Type": "application/json"}
+        request_body = orjson.loads(keyword_arguments_of_stream_call["content"])
+        assert request_body["messages"][1] == {"role": "user", "content": "A cat"}
+        assert request_body["stream"] is False
+
+    @pytest.mark.asyncio
+    async def test_pre_serialised_request_body_matches_serialising_the_full_body(self):
+        service = _build_llama_cpp_client()
+        mock_response = _build_mock_of_json_streaming_response("Enhanced prompt text")
+        _configure_stream_mock(service, mock_response)
+        original_prompt = 'A "quoted" cat\nwith ünïcödé and a backslash \\'
+
+        await service.enhance_prompt(original_prompt)
+
+        expected_request_body = {
+            "messages": [
+                {
+                    "role": "system",
+                    "content": application.integrations.llama_cpp_client.DEFAULT_SYSTEM_PROMPT,
+                },
+                {"role": "user", "content": original_prompt},
+            ],
+            "temperature": 0.7,
+            "max_tokens": 512,
+            "stream": False,
+        }
+        assert service.http_client.stream.call_args.kwargs["content"] == orjson.dumps(expected_request_body)
+
     @pytest.mark.asyncio
     async def test_strips_whitespace(self):
         service = _build_llama_cpp_client()
@@ -275,6 +322,19 @@ class TestEnhancePrompt:
         ):
             await service.enhance_prompt("A cat")
 
+    @pytest.mark.asyncio
+    async def test_invalid_utf8_response_raises_unavailable_error(self):
+        service = _build_llama_cpp_client()
+
+        mock_response = _build_mock_of_streaming_response(body_bytes=b'{"choices": "\xff"}')
+        _configure_stream_mock(service, mock_response)
+
+        with pytest.raises(
+            application.exceptions.LargeLanguageModelServiceUnavailableError,
+            match="non-JSON response",
+        ):
+            await service.enhance_prompt("A cat")
+
 
 class TestStreamingResponseDetection:
     """
@@ -382,6 +442,26 @@ class TestResponseBodySizeLimit:
         ):
             await service.enhance_prompt("A cat")
 
+    @pytest.mark.asyncio
+    async def test_oversized_declared_content_length_rejected_before_reading_body(self) -> None:
+        """
+        When the upstream declares a Content-Length above the limit, the
+        response is rejected without iterating over the body.
+        """
+        service = _build_llama_cpp_client(maximum_number_of_bytes_of_response_body=100)
+        mock_response = _build_mock_of_streaming_response(
+            body_bytes=b"{}",
+            headers={"content-type": "application/json", "content-length": "5000"},
+        )
+        mock_response.aiter_bytes = MagicMock(side_effect=AssertionError("The body must not be read"))
+        _configure_stream_mock(service, mock_response)
+
+        with pytest.raises(
+            application.exceptions.LargeLanguageModelServiceUnavailableError,
+            match=r"\(5000 bytes\) exceeds the configured maximum",
+        ):
+            await service.enhance_prompt("A cat")
+
     @pytest.mark.asyncio
     async def test_response_within_limit_succeeds(self) -> None:
         """
@@ -554,77 +634,373 @@ class TestFinishReasonTruncationDetection:
         assert "prompt_enhancement_truncated" not in captured_output.out
 
     @pytest.mark.asyncio
-    async def test_finish_reason_extraction_survives_corrupted_choices_structure(
-        self,
-    ) -> None:
+    async def test_finish_reason_is_read_from_the_same_choice_as_the_content(self, capsys) -> None:
         """
-        The ``finish_reason`` extraction is wrapped in a defensive
-        ``try/except (KeyError, IndexError)`` guard.  This guard
-        protects against the unlikely scenario where the ``choices``
-        list is accessible during prompt extraction but becomes
-        inaccessible during the subsequent ``finish_reason`` lookup.
-
-        This test uses a custom list subclass that empties itself after
-        the first index access, simulating a consumable-once data
-        structure.  The prompt extraction succeeds on the first access,
-        then the ``finish_reason`` extraction encounters an empty list
-        and enters the ``except IndexError`` branch.
-
-        The enhanced prompt must still be returned successfully — the
-        ``finish_reason`` guard is informational and must never prevent
-        a valid prompt from being delivered.
-        """
-
-        class SingleAccessList(list):
-            """
-            A list that clears itself after the first ``__getitem__``
-            call, causing subsequent index operations to raise
-            ``IndexError``.
-            """
-
-            def __init__(self, *args):
-                super().__init__(*args)
-                self._first_access_completed = False
-
-            def __getitem__(self, index):
-                result = super().__getitem__(index)
-                if not self._first_access_completed:
-                    self._first_access_completed = True
-                    self.clear()
-                return result
-
-        choices_entry = {
-            "message": {"content": "Enhanced prompt from corrupted response"},
-            "finish_reason": "stop",
+        The first choice is looked up once, so the ``finish_reason`` is
+        read from the same entry that supplied the enhanced prompt even
+        when later choices carry a different ``finish_reason``.
+        """
+        service = _build_llama_cpp_client()
+        response_body = {
+            "choices": [
+                {"message": {"content": "First choice"}, "finish_reason": "length"},
+                {"message": {"content": "Second choice"}, "finish_reason": "stop"},
+            ],
         }
+        mock_response = _build_mock_of_streaming_response(body_bytes=orjson.dumps(response_body))
+        _configure_stream_mock(service, mock_response)
 
-        # The raw bytes use a normal list for valid JSON serialisation.
-        serialised_body = json.dumps({"choices": [choices_entry]}).encode("utf-8")
+        result = await service.enhance_prompt("A cat")
 
-        mock_response = _build_mock_of_streaming_response(
-            body_bytes=serialised_body,
+        assert result == "First choice"
+        captured_output = capsys.readouterr()
+        assert "prompt_enhancement_truncated" in captured_output.out
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "response_body",
+        [
+            ["not", "an", "object"],
+            {"choices": ["not an object"]},
+            {"choices": [{"message": {"content": 42}}]},
+        ],
+    )
+    async def test_response_of_unexpected_types_raises_prompt_enhancement_error(self, response_body) -> None:
+        """
+        JSON arrays, scalars, or a non-string content where the chat
+        completion layout expects objects and strings map to
+        ``PromptEnhancementError`` rather than an unhandled ``TypeError``
+        or ``AttributeError``.
+        """
+        service = _build_llama_cpp_client()
+        mock_response = _build_mock_of_streaming_response(body_bytes=orjson.dumps(response_body))
+        _configure_stream_mock(service, mock_response)
+
+        with pytest.raises(
+            application.exceptions.PromptEnhancementError,
+            match="unexpected response structure",
+        ):
+            await service.enhance_prompt("A cat")
+
+
+def _configure_stream_mock_echoing_the_user_prompt(service):
+    """
+    Configure the service's http_client so that every ``stream()`` call
+    returns a fresh response whose enhanced prompt echoes the user prompt
+    of the request, allowing repeated calls against the same client.
+    """
+
+    def _stream_context_for_request(*args, **kwargs):
+        user_prompt = orjson.loads(kwargs["content"])["messages"][1]["content"]
+        return _mock_stream_context(_build_mock_of_json_streaming_response(f"Enhanced {user_prompt}"))
+
+    service.http_client = AsyncMock()
+    service.http_client.stream = MagicMock(side_effect=_stream_context_for_request)
+
+
+class TestCacheOfEnhancedPrompts:
+    @pytest.mark.asyncio
+    async def test_repeated_prompt_is_served_from_cache_at_zero_temperature(self):
+        service = _build_llama_cpp_client(
+            temperature=0.0,
+            maximum_number_of_entries_in_cache_of_enhanced_prompts=8,
         )
-        _configure_stream_mock(service := _build_llama_cpp_client(), mock_response)
+        _configure_stream_mock_echoing_the_user_prompt(service)
+
+        first_result = await service.enhance_prompt("A cat")
+        second_result = await service.enhance_prompt("A cat")
+
+        assert first_result == second_result == "Enhanced A cat"
+        assert service.http_client.stream.call_count == 1
 
-        # After json.loads produces the dict, we replace the choices
-        # list with the SingleAccessList so that the second index
-        # access (for finish_reason) raises IndexError.
-        import unittest.mock
+    @pytest.mark.asyncio
+    async def test_cache_hit_logs_the_enhancement_lifecycle_events(self):
+        """
+        A cache hit still logs ``prompt_enhancement_initiated`` and
+        ``prompt_enhancement_completed`` around the cache event, so the
+        combined-workflow log sequence holds whether or not llama.cpp is
+        invoked, and the completion is marked as served from the cache.
+        """
+        service = _build_llama_cpp_client(
+            temperature=0.0,
+            maximum_number_of_entries_in_cache_of_enhanced_prompts=8,
+        )
+        _configure_stream_mock_echoing_the_user_prompt(service)
+        await service.enhance_prompt("A cat")
 
-        original_json_loads = json.loads
+        with structlog.testing.capture_logs() as captured_logs:
+            await service.enhance_prompt("A cat")
 
-        def _patched_json_loads(data, **kwargs):
-            result = original_json_loads(data, **kwargs)
-            result["choices"] = SingleAccessList([choices_entry])
-            return result
+        assert [log["event"] for log in captured_logs] == [
+            "prompt_enhancement_initiated",
+            "prompt_enhancement_served_from_cache",
+            "prompt_enhancement_completed",
+        ]
+        assert captured_logs[-1]["served_from_cache"] is True
+        assert service.http_client.stream.call_count == 1
 
-        with unittest.mock.patch(
-            "application.integrations.llama_cpp_client.json.loads",
-            side_effect=_patched_json_loads,
-        ):
-            result = await service.enhance_prompt("A cat")
+    @pytest.mark.asyncio
+    async def test_upstream_completion_is_not_marked_as_served_from_cache(self):
+        service = _build_llama_cpp_client(
+            temperature=0.0,
+            maximum_number_of_entries_in_cache_of_enhanced_prompts=8,
+        )
+        _configure_stream_mock_echoing_the_user_prompt(service)
+
+        with structlog.testing.capture_logs() as captured_logs:
+            await service.enhance_prompt("A cat")
+
+        completion_events = [log for log in captured_logs if log["event"] == "prompt_enhancement_completed"]
+        assert completion_events[0]["served_from_cache"] is False
+
+    @pytest.mark.asyncio
+    async def test_cache_is_not_consulted_at_non_zero_temperature(self):
+        service = _build_llama_cpp_client(
+            temperature=0.7,
+            maximum_number_of_entries_in_cache_of_enhanced_prompts=8,
+        )
+        _configure_stream_mock_echoing_the_user_prompt(service)
+
+        await service.enhance_prompt("A cat")
+        await service.enhance_prompt("A cat")
+
+        assert service.http_client.stream.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_is_disabled_when_maximum_number_of_entries_is_zero(self):
+        service = _build_llama_cpp_client(temperature=0.0)
+        _configure_stream_mock_echoing_the_user_prompt(service)
+
+        await service.enhance_prompt("A cat")
+        await service.enhance_prompt("A cat")
+
+        assert service.http_client.stream.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_is_evicted_when_full(self):
+        service = _build_llama_cpp_client(
+            temperature=0.0,
+            maximum_number_of_entries_in_cache_of_enhanced_prompts=2,
+        )
+        _configure_stream_mock_echoing_the_user_prompt(service)
+
+        await service.enhance_prompt("A cat")
+        await service.enhance_prompt("A dog")
+        # Touching "A cat" makes "A dog" the least recently used entry.
+        await service.enhance_prompt("A cat")
+        await service.enhance_prompt("A bird")
+        assert service.http_client.stream.call_count == 3
+
+        await service.enhance_prompt("A cat")
+        assert service.http_client.stream.call_count == 3
+
+        await service.enhance_prompt("A dog")
+        assert service.http_client.stream.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_cache_lookups_are_counted_by_result(self):
+        service = _build_llama_cpp_client(
+            temperature=0.0,
+            maximum_number_of_entries_in_cache_of_enhanced_prompts=8,
+        )
+        _configure_stream_mock_echoing_the_user_prompt(service)
+        counter = application.prometheus_metrics.counter_of_lookups_in_cache_of_enhanced_prompts
+        number_of_hits_before = counter.labels(result="hit")._value.get()
+        number_of_misses_before = counter.labels(result="miss")._value.get()
+
+        await service.enhance_prompt("A cat")
+        await service.enhance_prompt("A cat")
+        await service.enhance_prompt("A dog")
+
+        assert counter.labels(result="hit")._value.get() - number_of_hits_before == 1
+        assert counter.labels(result="miss")._value.get() - number_of_misses_before == 2
+
+    def test_key_depends_on_system_prompt_original_prompt_and_maximum_tokens(self):
+        service = _build_llama_cpp_client(
+            temperature=0.0,
+            maximum_number_of_entries_in_cache_of_enhanced_prompts=8,
+        )
+        key = service._compute_key_in_cache_of_enhanced_prompts("A cat")
+
+        assert len(key) == 64
+        assert key == service._compute_key_in_cache_of_enhanced_prompts("A cat")
+        assert key != service._compute_key_in_cache_of_enhanced_prompts("A dog")
+        service._system_prompt = "A different system prompt"
+        assert key != service._compute_key_in_cache_of_enhanced_prompts("A cat")
+        service._system_prompt = application.integrations.llama_cpp_client.DEFAULT_SYSTEM_PROMPT
+        service._maximum_tokens = 256
+        assert key != service._compute_key_in_cache_of_enhanced_prompts("A cat")
+
+    @pytest.mark.asyncio
+    async def test_failed_enhancement_is_not_cached(self):
+        service = _build_llama_cpp_client(
+            temperature=0.0,
+            maximum_number_of_entries_in_cache_of_enhanced_prompts=8,
+        )
+        _configure_stream_mock(service, _build_mock_of_json_streaming_response(""))
+
+        with pytest.raises(application.exceptions.PromptEnhancementError):
+            await service.enhance_prompt("A cat")
+
+        _configure_stream_mock_echoing_the_user_prompt(service)
+        assert await service.enhance_prompt("A cat") == "Enhanced A cat"
+        assert service.http_client.stream.call_count == 1
+
+
+def _replace_upstream_request_with_gated_mock(service, side_effect=None):
+    """
+    Replace the upstream request of the service with a mock that blocks
+    until the returned event is set, so that tests can hold several
+    concurrent callers inside the same in-flight enhancement.
+    """
+    gate_of_upstream_request = asyncio.Event()
+
+    async def _gated_upstream_request(original_prompt):
+        await gate_of_upstream_request.wait()
+        if side_effect is not None:
+            raise side_effect
+        return f"Enhanced {original_prompt}"
+
+    service._request_enhanced_prompt_from_upstream = AsyncMock(side_effect=_gated_upstream_request)
+    return gate_of_upstream_request
+
+
+class TestSingleFlightCoalescing:
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_prompts_share_one_upstream_request(self):
+        service = _build_llama_cpp_client(temperature=0.0)
+        gate_of_upstream_request = _replace_upstream_request_with_gated_mock(service)
+
+        tasks = [asyncio.create_task(service.enhance_prompt("A cat")) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate_of_upstream_request.set()
+        results = await asyncio.gather(*tasks)
+
+        assert results == ["Enhanced A cat"] * 3
+        service._request_enhanced_prompt_from_upstream.assert_awaited_once_with("A cat")
+        assert service._in_flight_enhancements_of_prompts == {}
+
+    @pytest.mark.asyncio
+    async def test_coalesced_caller_logs_the_enhancement_lifecycle_events(self):
+        service = _build_llama_cpp_client(temperature=0.0)
+        gate_of_upstream_request = _replace_upstream_request_with_gated_mock(service)
+
+        with structlog.testing.capture_logs() as captured_logs:
+            tasks = [asyncio.create_task(service.enhance_prompt("A cat")) for _ in range(2)]
+            await asyncio.sleep(0)
+            gate_of_upstream_request.set()
+            await asyncio.gather(*tasks)
+
+        names_of_events = [entry["event"] for entry in captured_logs]
+        assert names_of_events == [
+            "prompt_enhancement_initiated",
+            "prompt_enhancement_initiated",
+            "prompt_enhancement_coalesced",
+            "prompt_enhancement_completed",
+        ]
+        assert captured_logs[-1]["coalesced"] is True
+        assert captured_logs[-1]["served_from_cache"] is False
+
+    @pytest.mark.asyncio
+    async def test_concurrent_distinct_prompts_are_not_coalesced(self):
+        service = _build_llama_cpp_client(temperature=0.0)
+        gate_of_upstream_request = _replace_upstream_request_with_gated_mock(service)
+
+        tasks = [asyncio.create_task(service.enhance_prompt(prompt)) for prompt in ("A cat", "A dog")]
+        await asyncio.sleep(0)
+        gate_of_upstream_request.set()
+        results = await asyncio.gather(*tasks)
+
+        assert results == ["Enhanced A cat", "Enhanced A dog"]
+        assert service._request_enhanced_prompt_from_upstream.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_requests_are_not_coalesced_at_non_zero_temperature(self):
+        service = _build_llama_cpp_client(temperature=0.7)
+        gate_of_upstream_request = _replace_upstream_request_with_gated_mock(service)
+
+        tasks = [asyncio.create_task(service.enhance_prompt("A cat")) for _ in range(2)]
+        await asyncio.sleep(0)
+        gate_of_upstream_request.set()
+        await asyncio.gather(*tasks)
+
+        assert service._request_enhanced_prompt_from_upstream.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_upstream_failure_is_raised_to_every_coalesced_caller(self):
+        service = _build_llama_cpp_client(temperature=0.0)
+        gate_of_upstream_request = _replace_upstream_request_with_gated_mock(
+            service,
+            side_effect=application.exceptions.LargeLanguageModelServiceUnavailableError(
+                detail="Upstream unavailable.",
+            ),
+        )
+
+        tasks = [asyncio.create_task(service.enhance_prompt("A cat")) for _ in range(2)]
+        await asyncio.sleep(0)
+        gate_of_upstream_request.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(
+            isinstance(result, application.exceptions.LargeLanguageModelServiceUnavailableError) for result in results
+        )
+        service._request_enhanced_prompt_from_upstream.assert_awaited_once()
+        assert service._in_flight_enhancements_of_prompts == {}
+
+    @pytest.mark.asyncio
+    async def test_cancelling_the_first_caller_does_not_cancel_the_others(self):
+        service = _build_llama_cpp_client(temperature=0.0)
+        gate_of_upstream_request = _replace_upstream_request_with_gated_mock(service)
+
+        first_task = asyncio.create_task(service.enhance_prompt("A cat"))
+        second_task = asyncio.create_task(service.enhance_prompt("A cat"))
+        await asyncio.sleep(0)
+        first_task.cancel()
+        gate_of_upstream_request.set()
+
+        assert await second_task == "Enhanced A cat"
+        with pytest.raises(asyncio.CancelledError):
+            await first_task
+
+
+class TestWarmUpConnectionPool:
+    @pytest.mark.asyncio
+    async def test_one_health_request_per_connection_of_pool(self):
+        service = application.integrations.llama_cpp_client.LlamaCppClient(
+            base_url_of_large_language_model_server="http://localhost:8080",
+            request_timeout_in_seconds=30.0,
+            size_of_connection_pool=4,
+        )
+        service.http_client = AsyncMock()
+        service.http_client.get = AsyncMock(return_value=MagicMock(spec=httpx.Response))
+
+        with structlog.testing.capture_logs() as captured_logs:
+            await service.warm_up_connection_pool()
+
+        assert service.http_client.get.await_count == 4
+        service.http_client.get.assert_awaited_with(
+            "/health",
+            timeout=application.integrations.llama_cpp_client._TIMEOUT_OF_CONNECTION_POOL_WARMUP_REQUEST_IN_SECONDS,
+        )
+        warmup_events = [log for log in captured_logs if log["event"] == "llama_cpp_connection_pool_warmed_up"]
+        assert warmup_events[0]["number_of_connections_opened"] == 4
+        assert not [log for log in captured_logs if log["event"] == "llama_cpp_connection_pool_warmup_failed"]
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted_but_not_raised(self):
+        service = _build_llama_cpp_client()
+        service.http_client = AsyncMock()
+        service.http_client.get = AsyncMock(side_effect=httpx.ConnectError("Connection refused"))
+
+        with structlog.testing.capture_logs() as captured_logs:
+            await service.warm_up_connection_pool()
 
-        assert result == "Enhanced prompt from corrupted response"
+        warmup_events = [log for log in captured_logs if log["event"] == "llama_cpp_connection_pool_warmed_up"]
+        assert warmup_events[0]["number_of_connections_opened"] == 0
+        failure_events = [log for log in captured_logs if log["event"] == "llama_cpp_connection_pool_warmup_failed"]
+        assert len(failure_events) == 1
+        assert failure_events[0]["log_level"] == "warning"
+        assert failure_events[0]["number_of_failed_warmup_requests"] == service._size_of_connection_pool
 
 
 class TestCheckHealth:
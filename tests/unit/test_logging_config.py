@@ -115,3 +115,21 @@ class TestConfigureLogging:
         assert parsed["event"] == "stdlib message"
         assert "service_name" in parsed
         assert "timestamp" in parsed
+
+    def test_native_structlog_calls_below_level_are_dropped_before_processing(self, capsys):
+        application.logging_config.configure_logging(log_level="WARNING")
+        names_of_processed_events = []
+
+        def _record_processed_event(logger, method_name, event_dict):
+            names_of_processed_events.append(event_dict["event"])
+            return event_dict
+
+        structlog.get_config()["processors"].insert(0, _record_processed_event)
+        test_logger = structlog.get_logger("test")
+        test_logger.info("suppressed_event")
+        test_logger.warning("emitted_event")
+
+        captured_lines = capsys.readouterr().out.strip().splitlines()
+
+        assert names_of_processed_events == ["emitted_event"]
+        assert [json.loads(line)["event"] for line in captured_lines] == ["emitted_event"]
@@ -30,6 +30,7 @@ class TestPrometheusMetrics:
         )
         original_in_flight_gauge = prometheus.gauge_of_number_of_http_requests_in_flight
         original_safety_filter_counter = prometheus.counter_of_number_of_generated_images_rejected_by_safety_filter
+        original_cache_lookups_counter = prometheus.counter_of_lookups_in_cache_of_enhanced_prompts
 
         test_registry = prometheus_client.CollectorRegistry()
         prometheus.registry_for_prometheus_metrics = test_registry
@@ -88,6 +89,12 @@ class TestPrometheusMetrics:
             "Total number of generated images rejected by the NSFW safety checker",
             registry=test_registry,
         )
+        prometheus.counter_of_lookups_in_cache_of_enhanced_prompts = prometheus_client.Counter(
+            "number_of_lookups_in_cache_of_enhanced_prompts_total",
+            "Total number of lookups in the cache of enhanced prompts",
+            ["result"],
+            registry=test_registry,
+        )
 
         yield test_registry
 
@@ -103,6 +110,7 @@ class TestPrometheusMetrics:
         )
         prometheus.gauge_of_number_of_http_requests_in_flight = original_in_flight_gauge
         prometheus.counter_of_number_of_generated_images_rejected_by_safety_filter = original_safety_filter_counter
+        prometheus.counter_of_lookups_in_cache_of_enhanced_prompts = original_cache_lookups_counter
 
     def test_counter_increments(self):
         prometheus.counter_of_http_requests_received.labels(
@@ -170,6 +178,14 @@ class TestPrometheusMetrics:
 
         assert counter._value.get() == 3.0
 
+    def test_cache_lookups_counter_increments_per_result(self):
+        counter = prometheus.counter_of_lookups_in_cache_of_enhanced_prompts
+        counter.labels(result="hit").inc()
+        counter.labels(result="miss").inc(2)
+
+        assert counter.labels(result="hit")._value.get() == 1.0
+        assert counter.labels(result="miss")._value.get() == 2.0
+
     def test_generate_latest_produces_text(self):
         output = prometheus_client.generate_latest(
             prometheus.registry_for_prometheus_metrics,
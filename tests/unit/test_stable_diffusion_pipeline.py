@@ -1,15 +1,24 @@
 """Tests for application/integrations/stable_diffusion_pipeline.py."""
 
+import asyncio
 import concurrent.futures
+import threading
 from unittest.mock import MagicMock, patch
 
+import diffusers
+import diffusers.utils.torch_utils
 import pytest
 import structlog
+import torch
 from PIL import Image
 
 import application.exceptions
 import application.integrations.stable_diffusion_pipeline
 
+_NUMBER_OF_BYTES_IN_2_GIBIBYTES = 2 * 1024 * 1024 * 1024
+_NUMBER_OF_BYTES_IN_4_GIBIBYTES = 4 * 1024 * 1024 * 1024
+_NUMBER_OF_BYTES_IN_8_GIBIBYTES = 8 * 1024 * 1024 * 1024
+
 
 def _create_test_image(width=64, height=64):
     """Create a small test PIL image."""
@@ -115,6 +124,52 @@ class TestGenerateImages:
         assert len(generation_result.base64_encoded_images) == 2
         assert generation_result.indices_flagged_by_content_safety_checker == []
 
+    @pytest.mark.asyncio
+    async def test_multiple_images_on_cuda_generated_in_single_batched_call(self):
+        """On CUDA, a multi-image request is generated in one pipeline call
+        with one identically seeded generator per image, so every image in
+        a fixed-seed batch starts from identical latents."""
+        service = _build_image_generation_service_with_mock_pipeline(device_type="cuda")
+        mock_result = MagicMock()
+        mock_result.images = [_create_test_image(), _create_test_image(), _create_test_image()]
+        mock_result.nsfw_content_detected = [False, False, False]
+        service._pipeline.return_value = mock_result
+
+        with patch("application.integrations.stable_diffusion_pipeline.torch") as mock_torch:
+            generation_result = await service.generate_images(
+                prompt="A cat",
+                image_width=512,
+                image_height=512,
+                number_of_images=3,
+                seed=42,
+            )
+
+        assert len(generation_result.base64_encoded_images) == 3
+        service._pipeline.assert_called_once()
+        keyword_arguments_passed_to_pipeline = service._pipeline.call_args.kwargs
+        assert keyword_arguments_passed_to_pipeline["num_images_per_prompt"] == 3
+        assert len(keyword_arguments_passed_to_pipeline["generator"]) == 3
+        assert mock_torch.Generator.return_value.manual_seed.call_count == 3
+        mock_torch.Generator.return_value.manual_seed.assert_called_with(42)
+
+    @pytest.mark.asyncio
+    async def test_fresh_random_number_generators_allocated_for_every_call(self):
+        """A timed-out inference keeps running after its pipeline instance
+        returns to the pool, so no generator object may be shared between
+        calls."""
+        service = _build_image_generation_service_with_mock_pipeline()
+        mock_result = MagicMock()
+        mock_result.images = [_create_test_image()]
+        mock_result.nsfw_content_detected = None
+        service._pipeline.return_value = mock_result
+
+        await service.generate_images(prompt="A cat", image_width=512, image_height=512, number_of_images=2, seed=7)
+        await service.generate_images(prompt="A cat", image_width=512, image_height=512, number_of_images=1, seed=9)
+
+        generators_passed_to_pipeline = [call.kwargs["generator"] for call in service._pipeline.call_args_list]
+        assert len({id(generator) for generator in generators_passed_to_pipeline}) == 3
+        assert [generator.initial_seed() for generator in generators_passed_to_pipeline] == [7, 7, 9]
+
     @pytest.mark.asyncio
     async def test_content_safety_flagged_image_replaced_with_none(self):
         """When the content safety checker flags an image, its base64 data
@@ -164,23 +219,29 @@ class TestGenerateImages:
         # With per-baseline-unit base of 0.01s and 512×512×1 the computed timeout is 0.01s
         service._inference_timeout_per_baseline_unit_in_seconds = 0.01
 
-        def slow_inference(*args, **kwargs):
-            import time
-
-            time.sleep(1)
-
-        service._pipeline.side_effect = slow_inference
-
-        with pytest.raises(
-            application.exceptions.ImageGenerationServiceUnavailableError,
-            match="timed out",
-        ):
-            await service.generate_images(
-                prompt="A cat",
-                image_width=512,
-                image_height=512,
-                number_of_images=1,
-            )
+        # The inference thread blocks until the test releases it, rather
+        # than sleeping for a fixed period, so no worker thread outlives
+        # the test.
+        release_of_inference = threading.Event()
+
+        def blocked_inference(*args, **kwargs):
+            release_of_inference.wait()
+
+        service._pipeline.side_effect = blocked_inference
+
+        try:
+            with pytest.raises(
+                application.exceptions.ImageGenerationServiceUnavailableError,
+                match="timed out",
+            ):
+                await service.generate_images(
+                    prompt="A cat",
+                    image_width=512,
+                    image_height=512,
+                    number_of_images=1,
+                )
+        finally:
+            release_of_inference.set()
 
     @pytest.mark.asyncio
     async def test_no_images(self):
@@ -206,9 +267,8 @@ class TestGenerateImages:
         ``torch.cuda.empty_cache()`` to release the GPU memory
         allocator's cached blocks back to the device.
 
-        This test exercises the CUDA branch at
-        image_generation_service.py line 500 — the ``if
-        self._device.type == "cuda": torch.cuda.empty_cache()``
+        This test exercises the CUDA branch — the ``if
+        self._inference_device_is_cuda: torch.cuda.empty_cache()``
         path inside ``_cleanup_after_inference()``.  The equivalent
         code path in the ``close()`` method is tested separately in
         ``TestClose.test_close_cuda``.
@@ -272,6 +332,144 @@ class TestGenerateImages:
         assert completion_events[0]["number_of_bytes_of_resident_set_size_of_process"] > 0
 
 
+def _build_small_unet(device, torch_data_type):
+    """Build a randomly initialised U-Net with the architecture of the
+    Stable Diffusion U-Net at a fraction of its size."""
+    torch.manual_seed(0)
+    unet = diffusers.UNet2DConditionModel(
+        sample_size=8,
+        in_channels=4,
+        out_channels=4,
+        layers_per_block=1,
+        block_out_channels=(32, 64),
+        down_block_types=("CrossAttnDownBlock2D", "DownBlock2D"),
+        up_block_types=("UpBlock2D", "CrossAttnUpBlock2D"),
+        cross_attention_dim=32,
+        norm_num_groups=32,
+    )
+    return unet.to(device=device, dtype=torch_data_type).eval()
+
+
+class TestDeterminismOfBatchedGeneration:
+    """
+    Real-tensor checks of the assumption behind the batched generation on
+    CUDA: images in a fixed-seed batch are byte-for-byte identical only if
+    they start from identical latents and the U-Net computes every item of
+    the batch identically.
+    """
+
+    def test_identically_seeded_generators_produce_identical_initial_latents(self):
+        pipeline_class = application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline
+        random_number_generators = pipeline_class._create_seeded_random_number_generators(
+            seed=42,
+            number_of_generators=3,
+        )
+
+        initial_latents = diffusers.utils.torch_utils.randn_tensor(
+            (3, 4, 64, 64),
+            generator=random_number_generators,
+            device=torch.device("cpu"),
+            dtype=torch.float32,
+        )
+
+        assert all(torch.equal(initial_latents[0], latents_of_image) for latents_of_image in initial_latents[1:])
+
+    @pytest.mark.skipif(not torch.cuda.is_available(), reason="requires a CUDA device")
+    def test_batched_unet_forward_pass_on_cuda_is_identical_for_every_image(self, monkeypatch):
+        """Runs the U-Net as inference does on CUDA (half precision,
+        channels-last, cuDNN autotuner, classifier-free guidance doubling
+        the batch) and checks that identical inputs yield identical outputs
+        for every item of the batch."""
+        device = torch.device("cuda")
+        monkeypatch.setattr(torch.backends.cudnn, "benchmark", True)
+        unet = _build_small_unet(device, torch.float16).to(memory_format=torch.channels_last)
+        number_of_images = 4
+        pipeline_class = application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline
+        random_number_generators = pipeline_class._create_seeded_random_number_generators(
+            seed=42,
+            number_of_generators=number_of_images,
+        )
+        latents = diffusers.utils.torch_utils.randn_tensor(
+            (number_of_images, 4, 8, 8),
+            generator=random_number_generators,
+            device=device,
+            dtype=torch.float16,
+        )
+        unconditional_embeddings = torch.zeros(1, 7, 32, device=device, dtype=torch.float16)
+        conditional_embeddings = torch.ones(1, 7, 32, device=device, dtype=torch.float16)
+        encoder_hidden_states = torch.cat(
+            [
+                unconditional_embeddings.expand(number_of_images, -1, -1),
+                conditional_embeddings.expand(number_of_images, -1, -1),
+            ]
+        )
+
+        with torch.inference_mode():
+            noise_prediction = unet(
+                torch.cat([latents] * 2),
+                10,
+                encoder_hidden_states=encoder_hidden_states,
+            ).sample
+        noise_prediction_unconditional, noise_prediction_conditional = noise_prediction.chunk(2)
+
+        for noise_prediction_of_half in (noise_prediction_unconditional, noise_prediction_conditional):
+            assert all(
+                torch.equal(noise_prediction_of_half[0], noise_prediction_of_image)
+                for noise_prediction_of_image in noise_prediction_of_half[1:]
+            )
+
+
+class TestEncodeImagesToBase64:
+    def test_images_encoded_as_png_with_fast_compression(self):
+        """Images are encoded losslessly as PNG at zlib compression level 1,
+        which favours encoding speed over a marginally smaller output."""
+        test_image = _create_test_image()
+
+        base64_encoded_images = (
+            application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline._encode_images_to_base64(
+                [test_image], frozenset()
+            )
+        )
+
+        import base64
+        import io
+
+        decoded_image = Image.open(io.BytesIO(base64.b64decode(base64_encoded_images[0])))
+        assert decoded_image.format == "PNG"
+        assert decoded_image.tobytes() == test_image.tobytes()
+
+    def test_each_image_encoded_independently_when_buffer_is_reused(self):
+        """Reusing one buffer across the batch must not leak bytes from a
+        larger earlier image into a smaller later one."""
+        large_image = Image.effect_noise((256, 256), 100).convert("RGB")
+        small_image = _create_test_image()
+
+        base64_encoded_images = (
+            application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline._encode_images_to_base64(
+                [large_image, small_image, large_image], frozenset()
+            )
+        )
+
+        import base64
+        import io
+
+        decoded_images = [
+            Image.open(io.BytesIO(base64.b64decode(encoded_image))) for encoded_image in base64_encoded_images
+        ]
+        assert decoded_images[1].tobytes() == small_image.tobytes()
+        assert decoded_images[0].tobytes() == large_image.tobytes()
+        assert base64_encoded_images[0] == base64_encoded_images[2]
+
+    def test_png_compression_level_passed_to_pillow(self):
+        mock_image = MagicMock()
+
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline._encode_images_to_base64(
+            [mock_image], frozenset()
+        )
+
+        assert mock_image.save.call_args.kwargs == {"format": "PNG", "compress_level": 1}
+
+
 class TestRunStartupWarmup:
     """
     Tests for the ``run_startup_warmup`` method, which performs a minimal
@@ -324,6 +522,83 @@ class TestRunStartupWarmup:
         assert keyword_arguments_passed_to_pipeline.kwargs["num_inference_steps"] == 1
         assert keyword_arguments_passed_to_pipeline.kwargs["guidance_scale"] == 1.0
 
+    @pytest.mark.asyncio
+    async def test_warmup_of_compiled_unet_runs_at_production_shape(self):
+        """
+        A compiled U-Net is specialised for the shapes of its first forward
+        pass, so the warmup must run at 512×512 with the configured steps
+        and classifier-free guidance for real requests to reuse the
+        compiled graph.
+        """
+        service = application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline(
+            pipeline=MagicMock(),
+            device=MagicMock(type="cpu"),
+            thread_pool_executor_for_inference=MagicMock(),
+            number_of_inference_steps=12,
+            guidance_scale=7.0,
+            unet_is_compiled=True,
+        )
+
+        await service.run_startup_warmup()
+
+        keyword_arguments_passed_to_pipeline = service._pipeline.call_args.kwargs
+        assert keyword_arguments_passed_to_pipeline["width"] == 512
+        assert keyword_arguments_passed_to_pipeline["height"] == 512
+        assert keyword_arguments_passed_to_pipeline["num_images_per_prompt"] == 1
+        assert keyword_arguments_passed_to_pipeline["num_inference_steps"] == 12
+        assert keyword_arguments_passed_to_pipeline["guidance_scale"] == 7.0
+
+    @pytest.mark.asyncio
+    async def test_warmup_runs_under_the_same_inference_mode_as_generation(self):
+        """
+        The guards of a compiled U-Net include the grad and inference mode,
+        so the warmup must call the pipeline in the same mode as a real
+        request for the first request to reuse the compiled graph.
+        """
+        service = _build_image_generation_service_with_mock_pipeline()
+        modes_of_pipeline_calls = []
+
+        def _record_mode_of_pipeline_call(**keyword_arguments):
+            modes_of_pipeline_calls.append((torch.is_inference_mode_enabled(), torch.is_grad_enabled()))
+            mock_result = MagicMock()
+            mock_result.images = [_create_test_image()]
+            mock_result.nsfw_content_detected = None
+            return mock_result
+
+        service._pipeline.side_effect = _record_mode_of_pipeline_call
+
+        await service.run_startup_warmup()
+        await service.generate_images(prompt="A cat", image_width=512, image_height=512, number_of_images=1, seed=1)
+
+        assert modes_of_pipeline_calls == [(True, False), (True, False)]
+
+    @pytest.mark.asyncio
+    async def test_successful_warmup_on_cuda_synchronises_device_before_timing(self):
+        """
+        On CUDA devices the forward pass returns before the asynchronously
+        launched kernels have finished, so the warmup must wait for the
+        device before measuring the warmup latency.
+        """
+        service = _build_image_generation_service_with_mock_pipeline(device_type="cuda")
+        service._pipeline.return_value = MagicMock()
+
+        with patch("application.integrations.stable_diffusion_pipeline.torch") as mock_torch:
+            await service.run_startup_warmup()
+            mock_torch.cuda.synchronize.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_successful_warmup_on_cpu_does_not_synchronise_device(self):
+        """
+        CPU execution is synchronous, so no device synchronisation is
+        required (or possible) before measuring the warmup latency.
+        """
+        service = _build_image_generation_service_with_mock_pipeline(device_type="cpu")
+        service._pipeline.return_value = MagicMock()
+
+        with patch("application.integrations.stable_diffusion_pipeline.torch") as mock_torch:
+            await service.run_startup_warmup()
+            mock_torch.cuda.synchronize.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_warmup_failure_does_not_raise(self):
         """
@@ -437,6 +712,386 @@ class TestLoadPipeline:
             revision="abc123def456",
         )
 
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_compilation_of_unet_applied_on_cuda_when_enabled(self, mock_torch, mock_diffusers):
+        """When compilation is enabled on a CUDA device, the U-Net is
+        replaced by its ``torch.compile`` wrapper."""
+        mock_torch.cuda.is_available.return_value = True
+        mock_torch.device.return_value = MagicMock(type="cuda")
+        mock_torch.cuda.mem_get_info.return_value = (_NUMBER_OF_BYTES_IN_8_GIBIBYTES, _NUMBER_OF_BYTES_IN_8_GIBIBYTES)
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        original_unet = mock_pipeline.unet
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        service = application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cuda",
+            enable_compilation_of_unet=True,
+        )
+
+        mock_torch.compile.assert_called_once_with(original_unet, mode="default", fullgraph=True)
+        assert mock_pipeline.unet is mock_torch.compile.return_value
+        assert service._unet_is_compiled is True
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_compilation_of_unet_skipped_on_cpu(self, mock_torch, mock_diffusers):
+        """Compilation is a CUDA-only optimisation and is ignored on CPU
+        even when enabled."""
+        mock_torch.cuda.is_available.return_value = False
+        mock_torch.device.return_value = MagicMock(type="cpu")
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cpu",
+            enable_compilation_of_unet=True,
+        )
+
+        mock_torch.compile.assert_not_called()
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.psutil")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_physical_cores_divided_between_concurrency_slots_on_cpu(self, mock_torch, mock_psutil, mock_diffusers):
+        """On CPU, each concurrent inference receives an equal share of the
+        physical cores so that the pool instances do not oversubscribe
+        them."""
+        mock_torch.cuda.is_available.return_value = False
+        mock_torch.device.return_value = MagicMock(type="cpu")
+        mock_psutil.cpu_count.return_value = 16
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cpu",
+            number_of_concurrency_slots=4,
+        )
+
+        mock_psutil.cpu_count.assert_called_once_with(logical=False)
+        mock_torch.set_num_threads.assert_called_once_with(4)
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.psutil")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_at_least_one_thread_per_inference_on_cpu(self, mock_torch, mock_psutil, mock_diffusers):
+        mock_torch.cuda.is_available.return_value = False
+        mock_torch.device.return_value = MagicMock(type="cpu")
+        mock_psutil.cpu_count.return_value = 2
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cpu",
+            number_of_concurrency_slots=4,
+        )
+
+        mock_torch.set_num_threads.assert_called_once_with(1)
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_channels_last_memory_format_applied_on_cuda(self, mock_torch, mock_diffusers):
+        """On CUDA devices the U-Net and the VAE are converted to the
+        channels-last memory format so that convolutions dispatch to
+        NHWC kernels."""
+        mock_torch.cuda.is_available.return_value = True
+        mock_torch.device.return_value = MagicMock(type="cuda")
+        mock_torch.cuda.mem_get_info.return_value = (_NUMBER_OF_BYTES_IN_8_GIBIBYTES, _NUMBER_OF_BYTES_IN_8_GIBIBYTES)
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cuda",
+        )
+
+        mock_pipeline.unet.to.assert_called_once_with(memory_format=mock_torch.channels_last)
+        mock_pipeline.vae.to.assert_called_once_with(memory_format=mock_torch.channels_last)
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_cudnn_autotuner_and_tensor_float_32_enabled_on_cuda(self, mock_torch, mock_diffusers):
+        mock_torch.cuda.is_available.return_value = True
+        mock_torch.device.return_value = MagicMock(type="cuda")
+        mock_torch.cuda.mem_get_info.return_value = (_NUMBER_OF_BYTES_IN_8_GIBIBYTES, _NUMBER_OF_BYTES_IN_8_GIBIBYTES)
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cuda",
+        )
+
+        assert mock_torch.backends.cudnn.benchmark is True
+        assert mock_torch.backends.cuda.matmul.allow_tf32 is True
+        assert mock_torch.backends.cudnn.allow_tf32 is True
+        mock_torch.set_float32_matmul_precision.assert_called_once_with("high")
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_backends_of_torch_left_unchanged_on_cpu(self, mock_torch, mock_diffusers):
+        mock_torch.cuda.is_available.return_value = False
+        mock_torch.device.return_value = MagicMock(type="cpu")
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cpu",
+        )
+
+        mock_torch.set_float32_matmul_precision.assert_not_called()
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_channels_last_memory_format_not_applied_on_cpu(self, mock_torch, mock_diffusers):
+        mock_torch.cuda.is_available.return_value = False
+        mock_torch.device.return_value = MagicMock(type="cpu")
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cpu",
+        )
+
+        mock_pipeline.unet.to.assert_not_called()
+        mock_pipeline.vae.to.assert_not_called()
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_scaled_dot_product_attention_used_on_cuda_with_sufficient_vram(self, mock_torch, mock_diffusers):
+        """GPUs with at least 6 GiB of total VRAM use PyTorch's fused scaled
+        dot-product attention instead of attention slicing."""
+        mock_torch.cuda.is_available.return_value = True
+        mock_torch.device.return_value = MagicMock(type="cuda")
+        mock_torch.cuda.mem_get_info.return_value = (_NUMBER_OF_BYTES_IN_2_GIBIBYTES, _NUMBER_OF_BYTES_IN_8_GIBIBYTES)
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cuda",
+        )
+
+        mock_pipeline.unet.set_attn_processor.assert_called_once_with(
+            mock_diffusers.models.attention_processor.AttnProcessor2_0.return_value
+        )
+        mock_pipeline.enable_attention_slicing.assert_not_called()
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_attention_slicing_used_on_cuda_with_insufficient_vram(self, mock_torch, mock_diffusers):
+        mock_torch.cuda.is_available.return_value = True
+        mock_torch.device.return_value = MagicMock(type="cuda")
+        mock_torch.cuda.mem_get_info.return_value = (_NUMBER_OF_BYTES_IN_2_GIBIBYTES, _NUMBER_OF_BYTES_IN_4_GIBIBYTES)
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cuda",
+        )
+
+        mock_pipeline.enable_attention_slicing.assert_called_once()
+        mock_pipeline.unet.set_attn_processor.assert_not_called()
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_attention_slicing_used_on_cpu(self, mock_torch, mock_diffusers):
+        mock_torch.cuda.is_available.return_value = False
+        mock_torch.device.return_value = MagicMock(type="cpu")
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cpu",
+        )
+
+        mock_pipeline.enable_attention_slicing.assert_called_once()
+        mock_torch.cuda.mem_get_info.assert_not_called()
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_dpm_solver_multistep_scheduler_installed_by_default(self, mock_torch, mock_diffusers):
+        """The default scheduler is DPM-Solver++, built from the configuration
+        of the scheduler saved with the model so that its noise schedule is
+        preserved."""
+        mock_torch.cuda.is_available.return_value = False
+        mock_torch.device.return_value = MagicMock(type="cpu")
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        saved_scheduler = mock_pipeline.scheduler
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cpu",
+        )
+
+        mock_diffusers.DPMSolverMultistepScheduler.from_config.assert_called_once_with(saved_scheduler.config)
+        assert mock_pipeline.scheduler is mock_diffusers.DPMSolverMultistepScheduler.from_config.return_value
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_saved_scheduler_kept_when_default_requested(self, mock_torch, mock_diffusers):
+        mock_torch.cuda.is_available.return_value = False
+        mock_torch.device.return_value = MagicMock(type="cpu")
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        saved_scheduler = mock_pipeline.scheduler
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cpu",
+            name_of_scheduler="default",
+        )
+
+        mock_diffusers.DPMSolverMultistepScheduler.from_config.assert_not_called()
+        assert mock_pipeline.scheduler is saved_scheduler
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_int8_quantisation_of_unet_on_cuda(self, mock_torch, mock_diffusers):
+        """An 8-bit U-Net is loaded separately through bitsandbytes and
+        injected into the pipeline; it is neither converted to channels-last
+        nor compiled, since neither supports the quantised linear layers."""
+        mock_torch.cuda.is_available.return_value = True
+        mock_torch.device.return_value = MagicMock(type="cuda")
+        mock_torch.cuda.mem_get_info.return_value = (_NUMBER_OF_BYTES_IN_8_GIBIBYTES, _NUMBER_OF_BYTES_IN_8_GIBIBYTES)
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cuda",
+            enable_compilation_of_unet=True,
+            quantisation_of_unet="int8",
+        )
+
+        mock_diffusers.BitsAndBytesConfig.assert_called_once_with(load_in_8bit=True)
+        mock_diffusers.UNet2DConditionModel.from_pretrained.assert_called_once_with(
+            "test-model",
+            subfolder="unet",
+            revision="main",
+            torch_dtype=mock_torch.bfloat16,
+            quantization_config=mock_diffusers.BitsAndBytesConfig.return_value,
+        )
+        keyword_arguments_passed_to_pipeline = mock_diffusers.StableDiffusionPipeline.from_pretrained.call_args.kwargs
+        assert keyword_arguments_passed_to_pipeline["unet"] is (
+            mock_diffusers.UNet2DConditionModel.from_pretrained.return_value
+        )
+        mock_pipeline.unet.to.assert_not_called()
+        mock_torch.compile.assert_not_called()
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_quantisation_of_unet_ignored_on_cpu(self, mock_torch, mock_diffusers):
+        mock_torch.cuda.is_available.return_value = False
+        mock_torch.device.return_value = MagicMock(type="cpu")
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cpu",
+            quantisation_of_unet="int8",
+        )
+
+        mock_diffusers.UNet2DConditionModel.from_pretrained.assert_not_called()
+        assert "unet" not in mock_diffusers.StableDiffusionPipeline.from_pretrained.call_args.kwargs
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_bfloat16_selected_on_cuda_with_native_bfloat16_support(self, mock_torch, mock_diffusers):
+        mock_torch.cuda.is_available.return_value = True
+        mock_torch.cuda.is_bf16_supported.return_value = True
+        mock_torch.device.return_value = MagicMock(type="cuda")
+        mock_torch.cuda.mem_get_info.return_value = (_NUMBER_OF_BYTES_IN_8_GIBIBYTES, _NUMBER_OF_BYTES_IN_8_GIBIBYTES)
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cuda",
+        )
+
+        keyword_arguments_passed_to_pipeline = mock_diffusers.StableDiffusionPipeline.from_pretrained.call_args.kwargs
+        assert keyword_arguments_passed_to_pipeline["torch_dtype"] is mock_torch.bfloat16
+
+    @patch("application.integrations.stable_diffusion_pipeline.diffusers")
+    @patch("application.integrations.stable_diffusion_pipeline.torch")
+    def test_float16_selected_on_cuda_without_native_bfloat16_support(self, mock_torch, mock_diffusers):
+        mock_torch.cuda.is_available.return_value = True
+        mock_torch.cuda.is_bf16_supported.return_value = False
+        mock_torch.device.return_value = MagicMock(type="cuda")
+        mock_torch.cuda.mem_get_info.return_value = (_NUMBER_OF_BYTES_IN_8_GIBIBYTES, _NUMBER_OF_BYTES_IN_8_GIBIBYTES)
+        mock_pipeline = MagicMock()
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_diffusers.StableDiffusionPipeline.from_pretrained.return_value = mock_pipeline
+
+        thread_pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        application.integrations.stable_diffusion_pipeline.StableDiffusionPipeline.load_pipeline(
+            model_id="test-model",
+            thread_pool_executor_for_inference=thread_pool_executor,
+            device_preference="cuda",
+        )
+
+        keyword_arguments_passed_to_pipeline = mock_diffusers.StableDiffusionPipeline.from_pretrained.call_args.kwargs
+        assert keyword_arguments_passed_to_pipeline["torch_dtype"] is mock_torch.float16
+
 
 class TestCheckHealth:
     def test_healthy_when_pipeline_loaded(self):
@@ -469,56 +1124,157 @@ class TestClose:
 
         with patch("application.integrations.stable_diffusion_pipeline.torch") as mock_torch:
             await service.close()
+            mock_torch.cuda.synchronize.assert_called_once()
             mock_torch.cuda.empty_cache.assert_called_once()
+            mock_torch.cuda.ipc_collect.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_close_twice_is_safe(self):
+    async def test_close_detaches_weight_bearing_sub_modules(self):
         service = _build_image_generation_service_with_mock_pipeline(device_type="cpu")
+        pipeline = service._pipeline
 
         with patch("application.integrations.stable_diffusion_pipeline.torch"):
             await service.close()
-            await service.close()  # should not raise
 
+        assert not hasattr(service, "_pipeline")
+        assert pipeline.unet is None
+        assert pipeline.vae is None
+        assert pipeline.text_encoder is None
+        assert pipeline.safety_checker is None
 
-class TestComputeTimeout:
-    def test_gpu_baseline_image(self):
-        service = _build_image_generation_service_with_mock_pipeline(device_type="cuda")
-        service._inference_timeout_per_baseline_unit_in_seconds = 60.0
-        # 1 image × 512×512 → 60s (no multiplier on GPU)
-        assert service._compute_timeout(512, 512, 1) == pytest.approx(60.0)
+    @pytest.mark.asyncio
+    async def test_close_waits_for_in_flight_inference_before_detaching_sub_modules(self):
+        """An inference orphaned by a timeout keeps running in the executor,
+        so the sub-modules must not be detached until it has finished."""
+        service = _build_image_generation_service_with_mock_pipeline(device_type="cpu")
+        service._inference_timeout_per_baseline_unit_in_seconds = 0.01
+        pipeline = service._pipeline
+        original_unet = pipeline.unet
+        release_of_inference = threading.Event()
+        unets_seen_by_inference = []
 
-    def test_gpu_four_baseline_images(self):
-        service = _build_image_generation_service_with_mock_pipeline(device_type="cuda")
-        service._inference_timeout_per_baseline_unit_in_seconds = 60.0
-        # 4 images × 512×512 → 240s
-        assert service._compute_timeout(512, 512, 4) == pytest.approx(240.0)
+        def blocked_inference(**keyword_arguments):
+            release_of_inference.wait()
+            unets_seen_by_inference.append(pipeline.unet)
+            return MagicMock(images=[_create_test_image()], nsfw_content_detected=None)
 
-    def test_gpu_double_resolution(self):
-        service = _build_image_generation_service_with_mock_pipeline(device_type="cuda")
-        service._inference_timeout_per_baseline_unit_in_seconds = 60.0
-        # 1 image × 1024×1024 → ratio_of_pixel_area_to_baseline=4.0 → 240s
-        assert service._compute_timeout(1024, 1024, 1) == pytest.approx(240.0)
+        pipeline.side_effect = blocked_inference
 
-    def test_gpu_worst_case(self):
-        service = _build_image_generation_service_with_mock_pipeline(device_type="cuda")
-        service._inference_timeout_per_baseline_unit_in_seconds = 60.0
-        # 4 images × 1024×1024 → 960s
-        assert service._compute_timeout(1024, 1024, 4) == pytest.approx(960.0)
+        try:
+            with pytest.raises(application.exceptions.ImageGenerationServiceUnavailableError):
+                await service.generate_images(prompt="A cat", image_width=512, image_height=512, number_of_images=1)
+
+            with patch("application.integrations.stable_diffusion_pipeline.torch"):
+                task_of_close = asyncio.create_task(service.close())
+                await asyncio.sleep(0.05)
+                assert not task_of_close.done()
+                assert pipeline.unet is original_unet
 
-    def test_cpu_baseline_image(self):
+                release_of_inference.set()
+                await task_of_close
+        finally:
+            release_of_inference.set()
+
+        assert unets_seen_by_inference == [original_unet]
+        assert pipeline.unet is None
+
+    @pytest.mark.asyncio
+    async def test_close_stops_waiting_for_a_hung_inference(self):
+        """A hung inference must not stall the shutdown: after the bounded
+        wait, the pipeline is released anyway and the abandoned inference
+        is logged."""
         service = _build_image_generation_service_with_mock_pipeline(device_type="cpu")
-        service._inference_timeout_per_baseline_unit_in_seconds = 60.0
-        # 1 image × 512×512 → 60s (no multiplier; base encodes device tier)
-        assert service._compute_timeout(512, 512, 1) == pytest.approx(60.0)
+        service._inference_timeout_per_baseline_unit_in_seconds = 0.01
+        release_of_inference = threading.Event()
+        service._pipeline.side_effect = lambda **keyword_arguments: release_of_inference.wait()
+
+        try:
+            with pytest.raises(application.exceptions.ImageGenerationServiceUnavailableError):
+                await service.generate_images(prompt="A cat", image_width=512, image_height=512, number_of_images=1)
+
+            with (
+                patch("application.integrations.stable_diffusion_pipeline.torch"),
+                patch(
+                    "application.integrations.stable_diffusion_pipeline."
+                    "_MAXIMUM_WAIT_FOR_IN_FLIGHT_INFERENCES_ON_CLOSE_IN_SECONDS",
+                    0.05,
+                ),
+                structlog.testing.capture_logs() as captured_logs,
+            ):
+                await service.close()
+        finally:
+            release_of_inference.set()
+
+        assert not hasattr(service, "_pipeline")
+        warnings_of_abandoned_inferences = [
+            entry
+            for entry in captured_logs
+            if entry["event"] == "stable_diffusion_pipeline_released_with_inference_in_flight"
+        ]
+        assert len(warnings_of_abandoned_inferences) == 1
+        assert warnings_of_abandoned_inferences[0]["number_of_inferences_in_flight"] == 1
 
-    def test_cpu_double_resolution(self):
+    @pytest.mark.asyncio
+    async def test_close_leaves_the_shared_executor_running(self):
+        """The executor is shared by every pool instance and shut down by
+        the application lifespan, so closing one instance must leave it
+        usable by the others."""
         service = _build_image_generation_service_with_mock_pipeline(device_type="cpu")
-        service._inference_timeout_per_baseline_unit_in_seconds = 60.0
-        # 1 image × 1024×1024 → ratio_of_pixel_area_to_baseline=4.0 → 240s
-        assert service._compute_timeout(1024, 1024, 1) == pytest.approx(240.0)
 
-    def test_cpu_worst_case(self):
+        with patch("application.integrations.stable_diffusion_pipeline.torch"):
+            await service.close()
+
+        assert service._thread_pool_executor_for_inference.submit(lambda: "still running").result() == "still running"
+
+    @pytest.mark.asyncio
+    async def test_close_cuda_releases_device_memory_off_the_event_loop(self):
+        service = _build_image_generation_service_with_mock_pipeline(device_type="cuda")
+        threads_that_synchronised_the_device = []
+
+        with patch("application.integrations.stable_diffusion_pipeline.torch") as mock_torch:
+            mock_torch.cuda.synchronize.side_effect = lambda: threads_that_synchronised_the_device.append(
+                threading.current_thread()
+            )
+            await service.close()
+
+        assert threads_that_synchronised_the_device != [threading.current_thread()]
+        assert len(threads_that_synchronised_the_device) == 1
+
+    @pytest.mark.asyncio
+    async def test_close_twice_is_safe(self):
         service = _build_image_generation_service_with_mock_pipeline(device_type="cpu")
+
+        with patch("application.integrations.stable_diffusion_pipeline.torch"):
+            await service.close()
+            await service.close()  # should not raise
+
+
+class TestComputeTimeout:
+    @pytest.mark.parametrize(
+        ("device_type", "image_width", "image_height", "number_of_images", "expected_timeout_in_seconds"),
+        [
+            pytest.param("cuda", 512, 512, 1, 60.0, id="gpu_baseline_image"),
+            pytest.param("cuda", 512, 512, 4, 240.0, id="gpu_four_baseline_images"),
+            # 1024×1024 → ratio_of_pixel_area_to_baseline=4.0
+            pytest.param("cuda", 1024, 1024, 1, 240.0, id="gpu_double_resolution"),
+            pytest.param("cuda", 1024, 1024, 4, 960.0, id="gpu_worst_case"),
+            # No CPU multiplier: the per-baseline-unit base encodes the device tier.
+            pytest.param("cpu", 512, 512, 1, 60.0, id="cpu_baseline_image"),
+            pytest.param("cpu", 1024, 1024, 1, 240.0, id="cpu_double_resolution"),
+            pytest.param("cpu", 1024, 1024, 4, 960.0, id="cpu_worst_case"),
+        ],
+    )
+    def test_timeout_scales_with_number_of_images_and_pixel_area(
+        self,
+        device_type,
+        image_width,
+        image_height,
+        number_of_images,
+        expected_timeout_in_seconds,
+    ):
+        service = _build_image_generation_service_with_mock_pipeline(device_type=device_type)
         service._inference_timeout_per_baseline_unit_in_seconds = 60.0
-        # 4 images × 1024×1024 → 960s
-        assert service._compute_timeout(1024, 1024, 4) == pytest.approx(960.0)
+
+        assert service._compute_timeout(image_width, image_height, number_of_images) == pytest.approx(
+            expected_timeout_in_seconds
+        )